@@ -0,0 +1,52 @@
+"""
+Cliente ASGI mínimo: llama a la app FastAPI directamente, sin servidor ni
+sockets, para medir solo el coste de la aplicación.
+"""
+
+import json
+from typing import Any, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+async def asgi_request(app, method: str, url: str, body: Any = None) -> Tuple[int, bytes]:
+    """Envía una petición HTTP a `app` y devuelve (status, cuerpo completo)."""
+    parts = urlsplit(url)
+    payload = b"" if body is None else json.dumps(body).encode("utf-8")
+    headers = [(b"host", b"benchmark"), (b"content-length", str(len(payload)).encode())]
+    if body is not None:
+        headers.append((b"content-type", b"application/json"))
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method.upper(),
+        "scheme": "http",
+        "path": parts.path,
+        "raw_path": parts.path.encode(),
+        "query_string": parts.query.encode(),
+        "root_path": "",
+        "headers": headers,
+        "client": ("127.0.0.1", 0),
+        "server": ("benchmark", 80),
+    }
+    sent = False
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": payload, "more_body": False}
+        return {"type": "http.disconnect"}
+
+    status: Optional[int] = None
+    chunks = []
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status or 500, b"".join(chunks)
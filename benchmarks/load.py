@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Generador de carga asíncrono para la API.
+
+Lanza `--concurrency` clientes durante `--duration` segundos con una mezcla
+ponderada de peticiones y resume, por endpoint, throughput, latencias
+p50/p95/p99 y tasa de errores.
+
+    # En proceso, a través de la interfaz ASGI (sin servidor ni red)
+    python -m benchmarks.load --concurrency 32 --duration 20
+
+    # Contra un servidor local (uvicorn main:app --workers 4)
+    python -m benchmarks.load --url http://localhost:8000 --concurrency 64
+
+    # Mezcla propia: "MÉTODO ruta=peso", separadas por comas
+    python -m benchmarks.load --mix "GET /predict=80,POST /user/predict=20"
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import numpy as np
+
+# Tráfico típico: mayoría de /predict con parámetros por defecto (apps iOS y web)
+DEFAULT_MIX = ("GET /predict=60,POST /user/predict=20,GET /estadisticas=8,"
+               "GET /numeros/frecuencia=6,GET /sorteos?limit=10=4,GET /health=2")
+# Cuerpo de las peticiones POST de la mezcla
+DEFAULT_BODIES = {
+    "/user/predict": {"top_n": 10, "n_combinations": 5},
+    "/user/predict/batch": [{"top_n": 15, "n_combinations": 10}] * 10,
+    "/history/check": {"combinations": [[1, 2, 3, 4, 5, 6]]},
+}
+PERCENTILES = (50, 95, 99)
+
+Request = Tuple[str, str, Any]
+
+
+def parse_mix(spec: str) -> Tuple[List[Request], List[float]]:
+    """'GET /predict=60,POST /user/predict=20' → peticiones y pesos."""
+    requests, weights = [], []
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        target, _, weight = item.rpartition("=")
+        if not target:
+            raise ValueError(f"Falta el peso en la entrada de mezcla: {item!r}")
+        method, _, path = target.strip().partition(" ")
+        method, path = method.upper(), path.strip()
+        if not path.startswith("/"):
+            raise ValueError(f"Entrada de mezcla no válida: {item!r}")
+        body = DEFAULT_BODIES.get(urlsplit(path).path) if method == "POST" else None
+        requests.append((method, path, body))
+        weights.append(float(weight))
+    if not requests:
+        raise ValueError("La mezcla de peticiones está vacía")
+    return requests, weights
+
+
+# --- Destinos ---
+
+class ASGITarget:
+    """La app FastAPI llamada en proceso."""
+
+    def __init__(self, app):
+        self.app = app
+
+    def connect(self) -> "ASGITarget":
+        return self
+
+    async def request(self, method: str, path: str, body: Any) -> int:
+        from benchmarks.asgi import asgi_request
+
+        status, _ = await asgi_request(self.app, method, path, body)
+        return status
+
+    async def close(self) -> None:
+        pass
+
+
+class HTTPTarget:
+    """Servidor HTTP/1.1 local; cada cliente mantiene su conexión keep-alive."""
+
+    def __init__(self, url: str):
+        parts = urlsplit(url)
+        if parts.scheme != "http":
+            raise ValueError("Solo se admite http:// (servidor local)")
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 80
+        self.prefix = parts.path.rstrip("/")
+
+    def connect(self) -> "HTTPConnection":
+        return HTTPConnection(self)
+
+
+class HTTPConnection:
+    def __init__(self, target: HTTPTarget):
+        self.target = target
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def request(self, method: str, path: str, body: Any) -> int:
+        try:
+            return await self._request(method, path, body)
+        except Exception:
+            await self.close()
+            raise
+
+    async def _request(self, method: str, path: str, body: Any) -> int:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.target.host, self.target.port)
+        payload = b"" if body is None else json.dumps(body).encode("utf-8")
+        head = (f"{method} {self.target.prefix}{path} HTTP/1.1\r\n"
+                f"Host: {self.target.host}:{self.target.port}\r\n"
+                f"Content-Length: {len(payload)}\r\n")
+        if body is not None:
+            head += "Content-Type: application/json\r\n"
+        self.writer.write(head.encode("latin-1") + b"\r\n" + payload)
+        await self.writer.drain()
+
+        status = int((await self.reader.readline()).split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip().lower()
+        if "content-length" in headers:
+            await self.reader.readexactly(int(headers["content-length"]))
+        elif headers.get("transfer-encoding") == "chunked":
+            while True:
+                size = int((await self.reader.readline()).split(b";")[0], 16)
+                await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        if headers.get("connection") == "close":
+            await self.close()
+        return status
+
+    async def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+            self.reader = None
+
+
+# --- Carga ---
+
+class Recorder:
+    """Latencias y errores por endpoint."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.statuses: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    def record(self, name: str, seconds: float, status: Optional[int]) -> None:
+        self.latencies[name].append(seconds)
+        self.statuses[name][str(status) if status is not None else "exception"] += 1
+        if status is None or status >= 400:
+            self.errors[name] += 1
+
+
+async def client(target, requests: List[Request], weights: List[float], deadline: float,
+                 recorder: Optional[Recorder], rng: random.Random) -> None:
+    connection = target.connect()
+    try:
+        while time.perf_counter() < deadline:
+            method, path, body = rng.choices(requests, weights)[0]
+            start = time.perf_counter()
+            try:
+                status = await connection.request(method, path, body)
+            except Exception:
+                status = None
+            if recorder is not None:
+                recorder.record(f"{method} {path}", time.perf_counter() - start, status)
+    finally:
+        await connection.close()
+
+
+async def run_load(target, requests: List[Request], weights: List[float], concurrency: int,
+                   duration: float, warmup: float = 0.0, seed: int = 0) -> Tuple[Recorder, float]:
+    if warmup > 0:
+        deadline = time.perf_counter() + warmup
+        await asyncio.gather(*(client(target, requests, weights, deadline, None, random.Random(seed + i))
+                               for i in range(concurrency)))
+    recorder = Recorder()
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(client(target, requests, weights, deadline, recorder, random.Random(seed + i))
+                           for i in range(concurrency)))
+    return recorder, time.perf_counter() - start
+
+
+def summarize(recorder: Recorder, elapsed: float) -> Dict[str, Any]:
+    def stats(latencies: List[float], errors: int) -> Dict[str, Any]:
+        values = np.asarray(latencies) * 1e3
+        p = np.percentile(values, PERCENTILES) if len(values) else [0.0] * len(PERCENTILES)
+        return {
+            "requests": len(values),
+            "requests_per_second": len(values) / elapsed,
+            "errors": errors,
+            "error_rate": errors / len(values) if len(values) else 0.0,
+            "mean_ms": float(values.mean()) if len(values) else 0.0,
+            **{f"p{q}_ms": float(v) for q, v in zip(PERCENTILES, p)},
+            "max_ms": float(values.max()) if len(values) else 0.0,
+        }
+
+    endpoints = {
+        name: {**stats(latencies, recorder.errors[name]), "statuses": dict(recorder.statuses[name])}
+        for name, latencies in sorted(recorder.latencies.items())
+    }
+    every = [v for latencies in recorder.latencies.values() for v in latencies]
+    return {"elapsed": elapsed, "endpoints": endpoints,
+            "total": stats(every, sum(recorder.errors.values()))}
+
+
+def print_report(summary: Dict[str, Any]) -> None:
+    header = f"{'endpoint':<42} {'req':>8} {'req/s':>9} {'err%':>6} {'p50':>8} {'p95':>8} {'p99':>8}"
+    print(f"\n📊 Resultados ({summary['elapsed']:.1f} s, latencias en ms)")
+    print(header)
+    print("-" * len(header))
+    rows = list(summary["endpoints"].items()) + [("TOTAL", summary["total"])]
+    for name, s in rows:
+        print(f"{name[:42]:<42} {s['requests']:>8} {s['requests_per_second']:>9.1f} "
+              f"{s['error_rate'] * 100:>6.2f} {s['p50_ms']:>8.2f} {s['p95_ms']:>8.2f} {s['p99_ms']:>8.2f}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Prueba de carga asíncrona de la API")
+    parser.add_argument("--url", help="Servidor local (http://host:puerto); por defecto, ASGI en proceso")
+    parser.add_argument("-c", "--concurrency", type=int, default=16, help="Clientes simultáneos")
+    parser.add_argument("-d", "--duration", type=float, default=10.0, help="Segundos de medición")
+    parser.add_argument("--warmup", type=float, default=1.0, help="Segundos de calentamiento")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="'MÉTODO ruta=peso,...'")
+    parser.add_argument("--seed", type=int, default=0, help="Semilla de la elección de peticiones")
+    parser.add_argument("--max-error-rate", type=float, default=0.0,
+                        help="Tasa de errores total permitida; por encima, código de salida 1")
+    parser.add_argument("-o", "--output", help="Fichero JSON con el resumen")
+    args = parser.parse_args(argv)
+
+    requests, weights = parse_mix(args.mix)
+    if args.url:
+        target = HTTPTarget(args.url)
+        print(f"🌐 Probando {args.url}")
+    else:
+        os.environ.setdefault("LOTTO_SHARED_DIR", "")
+        from main import app, engine
+
+        engine.load_models()
+        target = ASGITarget(app)
+        print("🌐 Probando la app en proceso (ASGI)")
+    print(f"⚙️  {args.concurrency} clientes, {args.duration:.0f} s, {len(requests)} tipos de petición")
+
+    recorder, elapsed = asyncio.run(run_load(
+        target, requests, weights, args.concurrency, args.duration, args.warmup, args.seed
+    ))
+    summary = summarize(recorder, elapsed)
+    print_report(summary)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"config": vars(args), **summary}, f, indent=2)
+        print(f"\n📁 Resumen guardado en: {args.output}")
+
+    if summary["total"]["error_rate"] > args.max_error_rate:
+        print(f"\n❌ Tasa de errores {summary['total']['error_rate']:.2%} "
+              f"por encima de {args.max_error_rate:.2%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
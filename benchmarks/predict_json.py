@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark de serialización de /predict: ruta pydantic frente a la ruta
+rápida (arrays del motor → JSON). Sin caché de respuestas ni HTTP.
+
+    python benchmarks/predict_json.py --top-n 15 --combinations 10 100 1000
+"""
+
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("LOTTO_SHARED_DIR", "")
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+
+from lotto_engine.encoding import HAS_ORJSON  # noqa: E402
+from main import PredictionResponse, engine  # noqa: E402
+
+
+def pydantic_body(top_n, n_combinations, seed):
+    """Ruta original: modelos pydantic validados por response_model y volcados a JSON."""
+    response = engine.predict(top_n, n_combinations, seed=seed)
+    validated = PredictionResponse.model_validate(jsonable_encoder(response))
+    return validated.model_dump_json().encode("utf-8")
+
+
+def fast_body(top_n, n_combinations, seed):
+    return engine.predict_fast(top_n, n_combinations, seed=seed)
+
+
+def bench(fn, *args, number):
+    best = min(timeit.repeat(lambda: fn(*args), number=number, repeat=5))
+    return best / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de serialización de /predict")
+    parser.add_argument("--top-n", type=int, default=15)
+    parser.add_argument("--combinations", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--number", type=int, default=200, help="Llamadas por repetición")
+    args = parser.parse_args()
+
+    engine.load_models()
+    print(f"⚙️  orjson: {'sí' if HAS_ORJSON else 'no (json estándar)'}")
+    for n in args.combinations:
+        slow = pydantic_body(args.top_n, n, 0)
+        fast = fast_body(args.top_n, n, 0)
+        # Mismo contenido salvo la marca de tiempo
+        a, b = json.loads(slow), json.loads(fast)
+        a["metadata"].pop("timestamp"), b["metadata"].pop("timestamp")
+        assert a == b, "la ruta rápida no produce el mismo JSON"
+
+        number = max(1, args.number * 10 // max(n, 10))
+        t_slow = bench(pydantic_body, args.top_n, n, 0, number=number)
+        t_fast = bench(fast_body, args.top_n, n, 0, number=number)
+        print(f"📊 n_combinations={n:>6}: pydantic {t_slow:9.1f} µs | "
+              f"rápida {t_fast:9.1f} µs | ahorro {t_slow - t_fast:9.1f} µs ({t_slow / t_fast:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
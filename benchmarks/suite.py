@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Suite de benchmarks en proceso (sin red) con resultados en JSON.
+
+    python -m benchmarks.suite -o benchmarks/results/actual.json
+    python -m benchmarks.suite --baseline benchmarks/results/base.json
+
+Casos:
+- engine: PredictionEngine.predict / predict_fast por top_n × n_combinations
+- transform: LottoTransformer.transform sobre CSV sintéticos de N filas
+- clean: CSVTransformer.clean_raw_data sobre CSV sintéticos de N filas
+- asgi: peticiones por segundo contra la app FastAPI vía ASGI
+
+Todos los tiempos son segundos por llamada (menos es mejor). Con
+`--baseline` se compara caso a caso y se sale con código 1 si alguno empeora
+más del umbral.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+os.environ.setdefault("LOTTO_SHARED_DIR", "")
+
+DEFAULT_SIZES = [1_500, 100_000, 10_000_000]
+DEFAULT_TOP_N = [6, 15, 49]
+DEFAULT_COMBINATIONS = [10, 1_000, 10_000]
+SUITES = ["engine", "transform", "clean", "asgi"]
+# Endpoints de la prueba ASGI: (método, url, cuerpo)
+ASGI_ENDPOINTS = [
+    ("GET", "/health", None),
+    ("GET", "/predict?top_n=15&n_combinations=10", None),
+    ("GET", "/predict?top_n=15&n_combinations=10&window=100&seed=1", None),
+    ("POST", "/user/predict", {"top_n": 10, "n_combinations": 5, "seed": 7}),
+    ("GET", "/estadisticas", None),
+    ("GET", "/numeros/frecuencia", None),
+    ("GET", "/sorteos?limit=10", None),
+]
+WRITE_CHUNK = 200_000
+
+
+# --- Medición ---
+
+def measure(fn: Callable[[], Any], min_time: float = 0.2, repeat: int = 5) -> Dict[str, Any]:
+    """
+    Segundos por llamada: mejor y mediana de `repeat` rondas. Las llamadas
+    rápidas se agrupan hasta durar `min_time`; las lentas se miden una vez.
+    """
+    start = time.perf_counter()
+    fn()
+    first = time.perf_counter() - start
+    if first >= min_time:
+        return {"seconds": first, "median": first, "rounds": 1, "number": 1}
+
+    number = max(1, int(min_time / max(first, 1e-9)))
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number)
+    return {"seconds": min(samples), "median": statistics.median(samples),
+            "rounds": repeat, "number": number}
+
+
+# --- Datos sintéticos ---
+
+def _draw_rows(rows: int, seed: int = 0):
+    """Fechas DD/MM/YYYY y sorteos (6 números, C, R, Joker) aleatorios, por bloques."""
+    rng = np.random.default_rng(seed)
+    for start in range(0, rows, WRITE_CHUNK):
+        n = min(WRITE_CHUNK, rows - start)
+        dates = np.datetime64("1985-10-17") + (start + np.arange(n)) % 36500
+        ymd = np.datetime_as_string(dates).tolist()
+        keys = rng.random((n, 49)).argsort(axis=1)[:, :7] + 1
+        numbers = np.sort(keys[:, :6], axis=1).tolist()
+        comp = keys[:, 6].tolist()
+        reintegro = rng.integers(0, 10, n).tolist()
+        joker = rng.integers(1_000_000, 9_999_999, n).tolist()
+        for i in range(n):
+            y, m, d = ymd[i][:4], ymd[i][5:7], ymd[i][8:]
+            yield f"{d}/{m}/{y}", numbers[i], comp[i], reintegro[i], joker[i]
+
+
+def write_lotto_raw(path: str, rows: int) -> None:
+    """CSV raw como data/historico_raw.csv (entrada de LottoTransformer)."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("FECHA,COMBINACIÓN GANADORA,,,,,,COMP.,R.,JOKER\n")
+        buffer = []
+        for fecha, nums, comp, r, joker in _draw_rows(rows):
+            buffer.append(f"{fecha},{nums[0]:02d},{nums[1]:02d},{nums[2]:02d},{nums[3]:02d},"
+                          f"{nums[4]:02d},{nums[5]:02d},{comp:02d},{r},{joker}\n")
+            if len(buffer) >= WRITE_CHUNK:
+                f.writelines(buffer)
+                buffer.clear()
+        f.writelines(buffer)
+
+
+def write_semicolon_raw(path: str, rows: int) -> None:
+    """CSV con metadatos y separador ';' (entrada de CSVTransformer)."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("LOTERÍA PRIMITIVA;;;;;;;;;\n*** Histórico de resultados ***;;;;;;;;;\n")
+        f.write("FECHA;N1;N2;N3;N4;N5;N6;C;R;JOKER\n")
+        buffer = []
+        for fecha, nums, comp, r, joker in _draw_rows(rows):
+            buffer.append(f"'{fecha}';{nums[0]};{nums[1]};{nums[2]};{nums[3]};"
+                          f"{nums[4]};{nums[5]};{comp};{r};'{joker}'\n")
+            if len(buffer) >= WRITE_CHUNK:
+                f.writelines(buffer)
+                buffer.clear()
+        f.writelines(buffer)
+
+
+class Budget:
+    """Salta tamaños cuyo tiempo estimado (lineal) supera `seconds`."""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.last: Optional[tuple] = None
+
+    def estimate(self, rows: int) -> Optional[float]:
+        if self.last is None:
+            return None
+        last_rows, last_seconds = self.last
+        return last_seconds * rows / last_rows
+
+    def record(self, rows: int, seconds: float) -> None:
+        self.last = (rows, seconds)
+
+
+# --- Casos ---
+
+def bench_engine(top_ns: List[int], combinations: List[int], min_time: float) -> Dict[str, Any]:
+    from main import engine
+
+    engine.load_models()
+    results = {}
+    for top_n in top_ns:
+        for n in combinations:
+            for name, fn in (("predict", engine.predict), ("predict_fast", engine.predict_fast)):
+                key = f"engine.{name}[top_n={top_n},n={n}]"
+                results[key] = measure(lambda: fn(top_n, n, seed=0), min_time)
+                print(f"   {key}: {results[key]['seconds'] * 1e3:.3f} ms")
+    return results
+
+
+def bench_file_case(name: str, sizes: List[int], workdir: str, writer: Callable[[str, int], None],
+                    run: Callable[[str, str], Any], budget_seconds: float,
+                    min_time: float) -> Dict[str, Any]:
+    results = {}
+    budget = Budget(budget_seconds)
+    for rows in sorted(sizes):
+        key = f"{name}[rows={rows}]"
+        estimate = budget.estimate(rows)
+        if estimate is not None and estimate > budget_seconds:
+            results[key] = {"skipped": True, "estimate_seconds": estimate}
+            print(f"   {key}: omitido (estimado {estimate:.0f} s > {budget_seconds:.0f} s)")
+            continue
+        source = os.path.join(workdir, f"{writer.__name__}-{rows}.csv")
+        if not os.path.exists(source):
+            writer(source, rows)
+        target = os.path.join(workdir, f"{name}-{rows}.out.csv")
+        with open(os.devnull, "w") as devnull:
+            # Los transformadores imprimen su resumen; no interesa aquí
+            stdout, sys.stdout = sys.stdout, devnull
+            try:
+                result = measure(lambda: run(source, target), min_time, repeat=3)
+            finally:
+                sys.stdout = stdout
+        result["rows_per_second"] = rows / result["seconds"]
+        budget.record(rows, result["seconds"])
+        results[key] = result
+        print(f"   {key}: {result['seconds']:.3f} s ({result['rows_per_second']:,.0f} filas/s)")
+    return results
+
+
+def bench_transform(sizes: List[int], workdir: str, budget: float, min_time: float) -> Dict[str, Any]:
+    from lotto_transformer import LottoTransformer
+
+    transformer = LottoTransformer()
+    return bench_file_case("transform", sizes, workdir, write_lotto_raw,
+                           transformer.transform, budget, min_time)
+
+
+def bench_clean(sizes: List[int], workdir: str, budget: float, min_time: float) -> Dict[str, Any]:
+    from csv_transformer import CSVTransformer
+
+    return bench_file_case("clean", sizes, workdir, write_semicolon_raw,
+                           lambda src, dst: CSVTransformer(src, dst).clean_raw_data(),
+                           budget, min_time)
+
+
+def bench_asgi(requests: int, concurrency: int) -> Dict[str, Any]:
+    from benchmarks.asgi import asgi_request
+    from main import app, engine
+
+    engine.load_models()
+
+    async def run(method, url, body):
+        queue = iter(range(requests))
+        failures = 0
+
+        async def worker():
+            nonlocal failures
+            for _ in queue:
+                status, _ = await asgi_request(app, method, url, body)
+                failures += status >= 400
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return time.perf_counter() - start, failures
+
+    results = {}
+    for method, url, body in ASGI_ENDPOINTS:
+        asyncio.run(run(method, url, body))  # calentamiento (cachés, carga perezosa)
+        # Mejor de tres rondas: la planificación del bucle de eventos mete ruido
+        elapsed, failures = min(asyncio.run(run(method, url, body)) for _ in range(3))
+        key = f"asgi[{method} {url}]"
+        results[key] = {"seconds": elapsed / requests, "requests_per_second": requests / elapsed,
+                        "requests": requests, "errors": failures}
+        print(f"   {key}: {requests / elapsed:,.0f} req/s")
+    return results
+
+
+# --- Resultados ---
+
+def environment() -> Dict[str, Any]:
+    try:
+        commit = subprocess.check_output(["git", "rev-parse", "--short", "HEAD"],
+                                         stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Imprime la comparación y devuelve los casos que empeoran más de `threshold`."""
+    regressions = []
+    print("\n📈 Comparación con la línea base (tiempo actual / base):")
+    for key, current in results.items():
+        base = baseline.get(key)
+        if not base or "seconds" not in base or "seconds" not in current:
+            continue
+        ratio = current["seconds"] / base["seconds"]
+        mark = "✅"
+        if ratio > 1 + threshold:
+            mark = "❌"
+            regressions.append(key)
+        elif ratio < 1 - threshold:
+            mark = "🚀"
+        print(f"   {mark} {key}: {ratio:.2f}x")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks en proceso de la API y los transformadores")
+    parser.add_argument("--only", nargs="+", choices=SUITES, default=SUITES, help="Casos a ejecutar")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Filas de los CSV sintéticos")
+    parser.add_argument("--top-n", type=int, nargs="+", default=DEFAULT_TOP_N)
+    parser.add_argument("--combinations", type=int, nargs="+", default=DEFAULT_COMBINATIONS)
+    parser.add_argument("--requests", type=int, default=2000, help="Peticiones por endpoint (asgi)")
+    parser.add_argument("--concurrency", type=int, default=16, help="Peticiones simultáneas (asgi)")
+    parser.add_argument("--budget", type=float, default=300.0,
+                        help="Segundos máximos estimados por tamaño; los mayores se omiten")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Duración mínima por ronda")
+    parser.add_argument("--workdir", help="Directorio para los CSV sintéticos (se reutilizan)")
+    parser.add_argument("--baseline", help="JSON de resultados previo con el que comparar")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Empeoramiento relativo que cuenta como regresión")
+    parser.add_argument("-o", "--output", help="Fichero JSON de resultados")
+    args = parser.parse_args()
+
+    workdir = args.workdir or os.path.join(tempfile.gettempdir(), "lotto_benchmarks")
+    os.makedirs(workdir, exist_ok=True)
+
+    results: Dict[str, Any] = {}
+    if "engine" in args.only:
+        print("⚙️  PredictionEngine")
+        results.update(bench_engine(args.top_n, args.combinations, args.min_time))
+    if "transform" in args.only:
+        print("🔄 LottoTransformer.transform")
+        results.update(bench_transform(args.sizes, workdir, args.budget, args.min_time))
+    if "clean" in args.only:
+        print("🧹 CSVTransformer.clean_raw_data")
+        results.update(bench_clean(args.sizes, workdir, args.budget, args.min_time))
+    if "asgi" in args.only:
+        print("🌐 Endpoints ASGI")
+        results.update(bench_asgi(args.requests, args.concurrency))
+
+    report = {"environment": environment(), "results": results}
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📁 Resultados guardados en: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regresiones por encima del {args.threshold:.0%}")
+            sys.exit(1)
+        print("\n✅ Sin regresiones")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@
 Módulo para transformar el archivo historico_raw.csv a historico_clean.csv
 """
 
+import csv
 import pandas as pd
 import re
 from datetime import datetime
@@ -12,79 +13,74 @@ import os
 class CSVTransformer:
     """Clase para transformar archivos CSV de la Primitiva"""
     
-    def __init__(self, input_file, output_file):
+    def __init__(self, input_file, output_file, max_records=None):
         self.input_file = input_file
         self.output_file = output_file
+        # Límite de registros a procesar (None = todos)
+        self.max_records = max_records
     
-    def clean_raw_data(self):
+    def clean_raw_data(self, max_records=None):
         """
-        Limpia el archivo CSV raw eliminando metadatos y procesando solo los datos de sorteos
+        Limpia el archivo CSV raw eliminando metadatos y procesando solo los datos de sorteos.
+        
+        Lee y escribe línea a línea (memoria constante): busca la cabecera,
+        limpia cada registro y lo añade a la salida. `max_records` (o el del
+        constructor) limita los registros; por defecto se procesan todos.
+        Devuelve el número de registros escritos.
         """
+        if max_records is None:
+            max_records = self.max_records
+        tmp_file = f"{self.output_file}.tmp"
         try:
-            # Leer el archivo completo
-            with open(self.input_file, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-            
-            # Encontrar la línea de cabecera
-            header_line = None
-            data_start = None
-            
-            for i, line in enumerate(lines):
-                if 'FECHA' in line and 'N1' in line:
-                    header_line = line.strip()
-                    data_start = i + 1
-                    break
-            
-            if header_line is None:
-                raise ValueError("No se encontró la cabecera del archivo")
-            
-            # Procesar cabecera
-            header = [col.strip() for col in header_line.split(';')]
-            
-            # Procesar datos
-            clean_data = []
-            count = 0
-            
-            for line in lines[data_start:]:
-                line = line.strip()
-                if not line or line.startswith('***'):
-                    continue
+            with open(self.input_file, 'r', encoding='utf-8', newline='') as f:
+                reader = csv.reader(f, delimiter=';')
                 
-                # Dividir por punto y coma
-                fields = [field.strip() for field in line.split(';')]
+                # Encontrar la línea de cabecera (sin leer el resto del archivo)
+                header = None
+                for row in reader:
+                    line = ';'.join(row)
+                    if 'FECHA' in line and 'N1' in line:
+                        header = [col.strip() for col in row]
+                        break
                 
-                if len(fields) >= len(header):
-                    # Limpiar campos
-                    cleaned_row = []
-                    for i, field in enumerate(fields[:len(header)]):
-                        # Remover comillas y espacios extra
-                        cleaned_field = field.strip().strip("'\"")
-                        cleaned_row.append(cleaned_field)
-                    
-                    clean_data.append(cleaned_row)
-                    count += 1
+                if header is None:
+                    raise ValueError("No se encontró la cabecera del archivo")
+                
+                # Procesar datos
+                count = 0
+                with open(tmp_file, 'w', encoding='utf-8', newline='') as out:
+                    writer = csv.writer(out, lineterminator='\n')
+                    writer.writerow(header)
                     
-                    # Limitar a 20 líneas como se solicita
-                    if count >= 20:
-                        break
-            
-            # Crear DataFrame
-            df = pd.DataFrame(clean_data, columns=header)
+                    for row in reader:
+                        if max_records is not None and count >= max_records:
+                            break
+                        if not row or (len(row) == 1 and not row[0].strip()):
+                            continue
+                        if row[0].strip().startswith('***'):
+                            continue
+                        
+                        if len(row) >= len(header):
+                            # Remover comillas y espacios extra
+                            writer.writerow([field.strip().strip("'\"") for field in row[:len(header)]])
+                            count += 1
             
-            # Guardar archivo limpio
-            df.to_csv(self.output_file, index=False, encoding='utf-8')
+            os.replace(tmp_file, self.output_file)
             
             print(f"✅ Archivo transformado exitosamente:")
             print(f"   - Archivo origen: {self.input_file}")
             print(f"   - Archivo destino: {self.output_file}")
-            print(f"   - Registros procesados: {len(df)}")
-            print(f"   - Columnas: {list(df.columns)}")
+            print(f"   - Registros procesados: {count}")
+            print(f"   - Columnas: {header}")
             
-            return df
+            return count
             
         except Exception as e:
             print(f"❌ Error al procesar el archivo: {str(e)}")
             raise
+        finally:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
     
     def get_sample_data(self, num_rows=5):
         """
@@ -98,9 +94,9 @@ class CSVTransformer:
             return None
 
 
-def transform_csv(input_path=None, output_path=None):
+def transform_csv(input_path=None, output_path=None, max_records=None):
     """
-    Función principal para transformar el CSV
+    Función principal para transformar el CSV; devuelve los registros escritos
     """
     if input_path is None:
         input_path = "data/historico_raw.csv"
@@ -117,10 +113,8 @@ def transform_csv(input_path=None, output_path=None):
         os.makedirs(output_dir)
     
     # Crear transformador y procesar
-    transformer = CSVTransformer(input_path, output_path)
-    df = transformer.clean_raw_data()
-    
-    return df
+    transformer = CSVTransformer(input_path, output_path, max_records)
+    return transformer.clean_raw_data()
 
 
 if __name__ == "__main__":
@@ -129,11 +123,11 @@ if __name__ == "__main__":
     output_file = "data/historico_clean.csv"
     
     try:
-        df = transform_csv(input_file, output_file)
+        transform_csv(input_file, output_file)
         
         # Mostrar muestra de datos
         print("\n📊 Muestra de datos procesados:")
-        print(df.head().to_string())
+        print(CSVTransformer(input_file, output_file).get_sample_data().to_string())
         
     except Exception as e:
         print(f"❌ Error: {str(e)}")
\ No newline at end of file
@@ -3,6 +3,7 @@
 
 from lotto_downloader import LottoDownloader
 from lotto_transformer import LottoTransformer
+from lotto_engine.persistence import DEFAULT_SNAPSHOT_FILE, export_snapshot
 import os
 
 def main():
@@ -21,7 +22,11 @@ def main():
         transformer.transform(raw_file, clean_file)
         print(f"✅ Transformación completada: {clean_file}")
         
-        # 3. Mostrar estadísticas
+        # 3. Snapshot binario para el arranque rápido de la API
+        snapshot = export_snapshot(clean_file, DEFAULT_SNAPSHOT_FILE)
+        print(f"✅ Snapshot generado: {DEFAULT_SNAPSHOT_FILE} ({snapshot.version})")
+        
+        # 4. Mostrar estadísticas
         if os.path.exists(clean_file):
             with open(clean_file, 'r', encoding='utf-8') as f:
                 lines = len(f.readlines()) - 1  # -1 por header
@@ -0,0 +1,18 @@
+"""
+Lotto Prediction Engine
+Estructuras de datos y cálculos vectorizados del motor de predicción.
+"""
+
+from .backtest import run_backtest
+from .history import DrawIndex
+from .scorers import NumpyLSTMEnsemble, Scorer, SimulatedScorer, load_scorer
+from .stats import DrawStatistics
+from .store import DrawStore
+from .snapshot import EngineSnapshot, FusionWeights, build_snapshot, fuse_scores
+
+__version__ = "1.0.0"
+__all__ = [
+    "DrawIndex", "DrawStatistics", "DrawStore", "EngineSnapshot", "FusionWeights",
+    "NumpyLSTMEnsemble", "Scorer", "SimulatedScorer",
+    "build_snapshot", "fuse_scores", "load_scorer", "run_backtest",
+]
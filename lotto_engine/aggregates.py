@@ -0,0 +1,93 @@
+"""
+Agregados del histórico (totales, rango de fechas, días de la semana y
+frecuencia por número) calculados al construir el snapshot y servidos como
+JSON ya serializado.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Optional
+
+import numpy as np
+
+from .constants import NUMBERS
+from .store import DOW_ES, DrawStore
+
+
+def _number_counts(numbers: np.ndarray) -> np.ndarray:
+    values = numbers[(numbers >= 1) & (numbers <= len(NUMBERS))].astype(np.int64)
+    return np.bincount(values - 1, minlength=len(NUMBERS))
+
+
+def _dow_counts(dow: np.ndarray) -> np.ndarray:
+    return np.bincount(dow[dow < len(DOW_ES)], minlength=len(DOW_ES))
+
+
+@dataclass(frozen=True)
+class JSONPayload:
+    """Cuerpo JSON serializado una vez, con su ETag."""
+    body: bytes
+
+    @cached_property
+    def etag(self) -> str:
+        return '"' + hashlib.sha1(self.body).hexdigest() + '"'
+
+    @classmethod
+    def from_data(cls, data) -> 'JSONPayload':
+        return cls(json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+
+@dataclass(frozen=True)
+class Aggregates:
+    """Agregados inmutables; `extend` devuelve una copia actualizada en O(filas nuevas)."""
+    total: int
+    first_date: Optional[np.datetime64]
+    last_date: Optional[np.datetime64]
+    dow_counts: np.ndarray
+    number_counts: np.ndarray
+
+    @classmethod
+    def from_store(cls, store: DrawStore) -> 'Aggregates':
+        return cls(
+            total=len(store),
+            first_date=store.dates[0] if len(store) else None,
+            last_date=store.dates[-1] if len(store) else None,
+            dow_counts=_dow_counts(store.dow),
+            number_counts=_number_counts(store.numbers),
+        )
+
+    def extend(self, store: DrawStore, start: int) -> 'Aggregates':
+        """Incorpora las filas store[start:] (sorteos posteriores a los ya agregados)."""
+        new = slice(start, len(store))
+        if start >= len(store):
+            return self
+        return Aggregates(
+            total=self.total + (len(store) - start),
+            first_date=self.first_date if self.first_date is not None else store.dates[start],
+            last_date=store.dates[-1],
+            dow_counts=self.dow_counts + _dow_counts(store.dow[new]),
+            number_counts=self.number_counts + _number_counts(store.numbers[new]),
+        )
+
+    @cached_property
+    def estadisticas(self) -> JSONPayload:
+        """Cuerpo de GET /estadisticas."""
+        return JSONPayload.from_data({
+            "total_sorteos": self.total,
+            "fecha_inicio": str(self.first_date) if self.first_date is not None else None,
+            "fecha_fin": str(self.last_date) if self.last_date is not None else None,
+            "dias_semana": {
+                name: count for name, count in zip(DOW_ES, self.dow_counts.tolist()) if count
+            },
+        })
+
+    @cached_property
+    def frecuencia(self) -> JSONPayload:
+        """Cuerpo de GET /numeros/frecuencia."""
+        return JSONPayload.from_data({
+            "frecuencia": {
+                str(num): count for num, count in zip(NUMBERS.tolist(), self.number_counts.tolist())
+            }
+        })
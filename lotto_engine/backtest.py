@@ -0,0 +1,155 @@
+"""
+Backtesting walk-forward de los pesos de la fusión LSTM + estadística.
+
+Recorre el histórico en orden de fecha, calcula el stat score disponible antes
+de cada sorteo con frecuencias incrementales (O(6) por sorteo) y el score LSTM
+con el histórico de ese momento, y evalúa una rejilla de pesos y factores de
+escala en paralelo.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from itertools import product
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .scorers import Scorer
+from .snapshot import NUMBER_COLUMNS, NUMBERS, FusionWeights, fuse_scores
+
+DEFAULT_LSTM_WEIGHTS = (0.0, 0.2, 0.4, 0.6, 0.8, 1.0)
+DEFAULT_STAT_SCALES = (1.0, 5.0, 10.0, 20.0)
+# Sorteos iniciales que solo alimentan las frecuencias
+DEFAULT_WARMUP = 50
+
+
+def load_draws(csv_file: str) -> np.ndarray:
+    """Combinaciones ganadoras (n × 6) en orden cronológico, sin filas incompletas."""
+    import pandas as pd
+    df = pd.read_csv(csv_file)
+    df = df.sort_values('fecha', kind='stable')
+    numbers = df[NUMBER_COLUMNS].apply(pd.to_numeric, errors='coerce').dropna()
+    draws = numbers.to_numpy(dtype=np.int64)
+    valid = ((draws >= 1) & (draws <= len(NUMBERS))).all(axis=1)
+    return draws[valid]
+
+
+def walk_forward_stats(draws: np.ndarray) -> np.ndarray:
+    """
+    Frecuencia normalizada de cada número antes de cada sorteo (n × 49).
+    Las cuentas se actualizan con los 6 números de cada sorteo, sin recalcular
+    sobre el prefijo.
+    """
+    stats = np.zeros((len(draws), len(NUMBERS)))
+    counts = np.zeros(len(NUMBERS))
+    total = 0
+    for t, draw in enumerate(draws):
+        if total:
+            np.divide(counts, total, out=stats[t])
+        counts[draw - 1] += 1
+        total += len(draw)
+    return stats
+
+
+def walk_forward_lstm(scorer: Scorer, draws: np.ndarray, start: int = 0,
+                      block: int = 1) -> np.ndarray:
+    """
+    Scores LSTM disponibles antes de cada sorteo (n × 49); las filas previas a
+    `start` quedan a cero. Con `block` > 1 el scorer se evalúa una vez cada
+    `block` sorteos, con el histórico anterior al primero del bloque.
+    """
+    scores = np.zeros((len(draws), len(NUMBERS)))
+    positions = np.arange(start, len(draws), max(block, 1))
+    if len(positions):
+        history = scorer.score_history(draws, positions)
+        owner = (np.arange(start, len(draws)) - start) // max(block, 1)
+        scores[start:] = history[owner]
+    return scores
+
+
+def hit_rate_curve(scores: np.ndarray, draws: np.ndarray) -> np.ndarray:
+    """
+    Fracción de números sorteados que caen en el top-k, para k = 1..49.
+    `scores` es (n × 49) y `draws` (n × 6).
+    """
+    order = np.argsort(-scores, axis=1, kind='stable')
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.broadcast_to(np.arange(len(NUMBERS)), order.shape), axis=1)
+    drawn_ranks = np.take_along_axis(ranks, draws - 1, axis=1)
+    hist = np.bincount(drawn_ranks.ravel(), minlength=len(NUMBERS))
+    return np.cumsum(hist) / drawn_ranks.size
+
+
+# Datos compartidos por los procesos del pool (se envían una vez por proceso)
+_worker_data: Dict[str, np.ndarray] = {}
+
+
+def _init_worker(stats: np.ndarray, lstm: np.ndarray, draws: np.ndarray) -> None:
+    _worker_data.update(stats=stats, lstm=lstm, draws=draws)
+
+
+def _evaluate(weights: FusionWeights) -> np.ndarray:
+    scores = fuse_scores(_worker_data['lstm'], _worker_data['stats'], weights)
+    return hit_rate_curve(scores, _worker_data['draws'])
+
+
+def weight_grid(lstm_weights: Sequence[float] = DEFAULT_LSTM_WEIGHTS,
+                stat_scales: Sequence[float] = DEFAULT_STAT_SCALES) -> List[FusionWeights]:
+    """Rejilla de configuraciones; el peso estadístico es 1 - peso LSTM."""
+    return [
+        FusionWeights(lstm=w, stat=round(1.0 - w, 6), stat_scale=scale)
+        for w, scale in product(lstm_weights, stat_scales)
+    ]
+
+
+def run_backtest(draws: np.ndarray,
+                 lstm_scores: np.ndarray,
+                 grid: Optional[List[FusionWeights]] = None,
+                 warmup: int = DEFAULT_WARMUP,
+                 top_n: int = 15,
+                 max_workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Evalúa cada configuración de la rejilla sobre los sorteos posteriores al
+    warmup. `lstm_scores` es (n × 49), alineado con `draws`, con la fila t
+    calculada solo con draws[:t] (ver walk_forward_lstm); un único vector
+    (49,) se repite para todos los sorteos.
+
+    Devuelve las curvas de hit rate ordenadas por acierto en `top_n`.
+    """
+    if not 1 <= top_n <= len(NUMBERS):
+        raise ValueError(f"top_n debe estar entre 1 y {len(NUMBERS)}")
+    grid = grid if grid is not None else weight_grid()
+    if len(draws) <= warmup:
+        raise ValueError(f"Se necesitan más de {warmup} sorteos para el backtest")
+    stats = walk_forward_stats(draws)[warmup:]
+    lstm = np.broadcast_to(lstm_scores, (len(draws), len(NUMBERS)))[warmup:]
+    evaluated = draws[warmup:]
+
+    workers = max_workers or os.cpu_count() or 1
+    workers = min(workers, len(grid))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(stats, np.ascontiguousarray(lstm), evaluated)) as pool:
+            curves = list(pool.map(_evaluate, grid))
+    else:
+        _init_worker(stats, lstm, evaluated)
+        curves = [_evaluate(w) for w in grid]
+
+    results = [
+        {
+            **asdict(weights),
+            'hit_rate_at_top_n': float(curve[top_n - 1]),
+            'curve': [round(float(v), 6) for v in curve],
+        }
+        for weights, curve in zip(grid, curves)
+    ]
+    results.sort(key=lambda r: r['hit_rate_at_top_n'], reverse=True)
+    return {
+        'draws_evaluated': int(len(evaluated)),
+        'warmup': warmup,
+        'top_n': top_n,
+        # Referencia: acierto esperado eligiendo top_n números al azar
+        'random_baseline_at_top_n': top_n / len(NUMBERS),
+        'results': results,
+    }
@@ -0,0 +1,68 @@
+"""Caché LRU con caducidad (TTL) para respuestas ya serializadas."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+DEFAULT_MAXSIZE = 512
+DEFAULT_TTL = 60.0
+# Cuerpos mayores no se guardan (p. ej. miles de combinaciones): se recalculan
+DEFAULT_MAX_ENTRY_BYTES = 256 * 1024
+# Tope de bytes entre todas las entradas
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+
+class ResponseCache:
+    """
+    Guarda cuerpos de respuesta (bytes) por clave. Las claves deben incluir la
+    versión del snapshot; `clear` se llama además al publicar uno nuevo.
+    La memoria queda acotada por `max_bytes`; los cuerpos de más de
+    `max_entry_bytes` no se guardan.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE, ttl: float = DEFAULT_TTL,
+                 max_entry_bytes: int = DEFAULT_MAX_ENTRY_BYTES,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_entry_bytes = max_entry_bytes
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, tuple[float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                    self.nbytes -= len(entry[1])
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, body: bytes) -> None:
+        if len(body) > self.max_entry_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.nbytes -= len(old[1])
+            self._entries[key] = (time.monotonic() + self.ttl, body)
+            self.nbytes += len(body)
+            while len(self._entries) > self.maxsize or self.nbytes > self.max_bytes:
+                self.nbytes -= len(self._entries.popitem(last=False)[1][1])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
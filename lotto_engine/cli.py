@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""CLI para las tareas fuera de línea del motor de predicción."""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from .backtest import (DEFAULT_LSTM_WEIGHTS, DEFAULT_STAT_SCALES, DEFAULT_WARMUP,
+                       load_draws, run_backtest, walk_forward_lstm, weight_grid)
+from .persistence import DEFAULT_SNAPSHOT_FILE, export_snapshot
+from .scorers import load_scorer
+from .snapshot import NUMBERS
+
+
+def backtest(args) -> None:
+    """Backtesting walk-forward de los pesos de fusión."""
+    draws = load_draws(args.csv)
+    scorer = load_scorer(args.models)
+    # Score LSTM de cada sorteo con el histórico anterior (sin fuga de futuro)
+    lstm_scores = walk_forward_lstm(scorer, draws, start=args.warmup, block=args.lstm_block)
+    print(f"🧠 Scores LSTM: {scorer.fingerprint} (cada {args.lstm_block} sorteos)")
+    report = run_backtest(
+        draws,
+        lstm_scores,
+        grid=weight_grid(args.lstm_weights, args.stat_scales),
+        warmup=args.warmup,
+        top_n=args.top_n,
+        max_workers=args.workers,
+    )
+
+    print(f"📊 Sorteos evaluados: {report['draws_evaluated']} (warmup {report['warmup']})")
+    print(f"   Azar en top {args.top_n}: {report['random_baseline_at_top_n']:.4f}")
+    for r in report['results'][:10]:
+        print(f"   lstm={r['lstm']:.2f} stat={r['stat']:.2f} scale={r['stat_scale']:g}"
+              f" -> {r['hit_rate_at_top_n']:.4f}")
+
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(json.dumps(report, indent=2), encoding='utf-8')
+        print(f"📁 Guardado en: {args.output}")
+
+
+def snapshot(args) -> None:
+    """Genera el snapshot binario que mapea la API al arrancar."""
+    snap = export_snapshot(args.csv, args.output, args.models)
+    print(f"✅ Snapshot {snap.version}: {snap.n_draws} sorteos ({snap.scorer})")
+    print(f"📁 Guardado en: {args.output}")
+
+
+def main():
+    """Función principal del CLI."""
+    parser = argparse.ArgumentParser(description="Herramientas del motor de predicción")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    bt = subparsers.add_parser("backtest", help="Backtesting walk-forward de los pesos de fusión")
+    bt.add_argument("--csv", default="data/historico_clean.csv", help="CSV limpio de sorteos")
+    bt.add_argument("--models", default="models", help="Directorio de modelos LSTM exportados")
+    bt.add_argument("--lstm-block", type=int, default=1,
+                    help="Recalcular el score LSTM cada N sorteos (1 = antes de cada sorteo)")
+    bt.add_argument("--lstm-weights", type=float, nargs="+", default=list(DEFAULT_LSTM_WEIGHTS),
+                    help="Pesos LSTM a evaluar (el estadístico es 1 - peso)")
+    bt.add_argument("--stat-scales", type=float, nargs="+", default=list(DEFAULT_STAT_SCALES),
+                    help="Factores de escala del stat score")
+    bt.add_argument("--warmup", type=int, default=DEFAULT_WARMUP,
+                    help="Sorteos iniciales sin evaluar")
+    bt.add_argument("--top-n", type=int, default=15, help="Corte para ordenar resultados")
+    bt.add_argument("--workers", type=int, default=None, help="Procesos (por defecto, núcleos)")
+    bt.add_argument("-o", "--output", help="Archivo JSON con las curvas de hit rate")
+    bt.set_defaults(func=backtest)
+
+    sn = subparsers.add_parser("snapshot", help="Genera el snapshot binario para la API")
+    sn.add_argument("--csv", default="data/historico_clean.csv", help="CSV limpio de sorteos")
+    sn.add_argument("--models", default="models", help="Directorio de modelos LSTM exportados")
+    sn.add_argument("-o", "--output", default=DEFAULT_SNAPSHOT_FILE, help="Archivo de snapshot")
+    sn.set_defaults(func=snapshot)
+
+    args = parser.parse_args()
+    # Antes de calcular los scores LSTM, que es lo costoso
+    if args.command == "backtest" and not 1 <= args.top_n <= len(NUMBERS):
+        parser.error(f"--top-n debe estar entre 1 y {len(NUMBERS)}")
+    try:
+        args.func(args)
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
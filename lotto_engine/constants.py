@@ -0,0 +1,6 @@
+"""Constantes compartidas del motor de predicción."""
+
+import numpy as np
+
+NUMBERS = np.arange(1, 50)
+NUMBER_COLUMNS = ['N1', 'N2', 'N3', 'N4', 'N5', 'N6']
@@ -0,0 +1,166 @@
+"""
+Estrategia de cobertura (wheeling): combinaciones elegidas para cubrir el
+máximo de parejas y tríos distintos de los números top-N.
+
+La cobertura se guarda en bitsets de 64 bits indexados por posición en el
+top-N: `pairs[i]` tiene el bit j si la pareja (i, j) ya salió en algún boleto
+y `triples[i, j]` el bit k si el trío (i, j, k) ya salió. Cada boleto se
+construye número a número eligiendo el que más parejas (y, a igualdad, tríos)
+nuevas aporta, con el score como desempate.
+
+El voraz cuesta del orden de un boleto por cada medio milisegundo, así que
+solo construye los MAX_COVER_COMBINATIONS primeros boletos; el resto se
+completa con combinaciones ponderadas sin repetir las ya emitidas.
+"""
+
+from math import comb
+from typing import Iterator, Optional
+
+import numpy as np
+
+from .history import popcount
+from .sampling import (COMBINATION_SIZE, DEFAULT_CHUNK_SIZE, MAX_ROUNDS, CombinationBitmap,
+                       gumbel_top_k, iter_combinations)
+
+MAX_NUMBERS = 64
+# Una pareja nueva vale más que cualquier número de tríos nuevos al añadir un número
+PAIR_WEIGHT = comb(COMBINATION_SIZE - 1, 2) + 1
+# Filas por intento al sustituir un boleto repetido por uno ponderado
+REPLACEMENT_ROWS = 64
+# Boletos que se construyen de forma voraz (unos 2-3 s); los siguientes son ponderados
+MAX_COVER_COMBINATIONS = 5000
+# Parejas de índices (i < j) entre k números elegidos, para cada k
+_PAIRS_OF = {k: np.triu_indices(k, 1) for k in range(MAX_NUMBERS + 1)}
+
+
+class CoverageTracker:
+    """Parejas y tríos cubiertos de `n` números, en bitsets."""
+
+    def __init__(self, n: int):
+        if n > MAX_NUMBERS:
+            raise ValueError(f"La cobertura admite como mucho {MAX_NUMBERS} números")
+        self.n = n
+        self.bits = np.left_shift(np.uint64(1), np.arange(n, dtype=np.uint64))
+        self.full = np.bitwise_or.reduce(self.bits) if n else np.uint64(0)
+        self.reset()
+
+    def reset(self) -> None:
+        self.pairs = np.zeros(self.n, dtype=np.uint64)
+        self.triples = np.zeros((self.n, self.n), dtype=np.uint64)
+
+    def add(self, ticket: np.ndarray) -> int:
+        """Marca el boleto (posiciones) como cubierto; devuelve parejas + tríos nuevos."""
+        bits = self.bits[ticket]
+        mask = np.bitwise_or.reduce(bits)
+        rows, cols = ticket[:, None], ticket[None, :]
+        pair_bits = mask ^ bits
+        trio_bits = mask ^ bits[:, None] ^ bits[None, :]
+        # Bits nuevos: cada pareja aparece 2 veces y cada trío 6 (fuera de la diagonal)
+        new_pairs = popcount(pair_bits & ~self.pairs[ticket]).sum()
+        new_trios = popcount(trio_bits & ~self.triples[rows, cols])
+        np.fill_diagonal(new_trios, 0)
+        self.pairs[ticket] |= pair_bits
+        self.triples[rows, cols] |= trio_bits
+        return int(new_pairs) // 2 + int(new_trios.sum()) // 6
+
+    def counts(self) -> "tuple[int, int]":
+        """Parejas y tríos cubiertos (cada uno contado una vez)."""
+        n_pairs = int(popcount(self.pairs).sum()) // 2
+        # La diagonal de `triples` no representa ningún trío
+        n_triples = int(popcount(self.triples).sum() - popcount(np.diagonal(self.triples)).sum()) // 6
+        return n_pairs, n_triples
+
+    def ratios(self) -> "tuple[float, float]":
+        """Fracción de parejas y de tríos cubiertos."""
+        n_pairs, n_triples = self.counts()
+        return n_pairs / max(comb(self.n, 2), 1), n_triples / max(comb(self.n, 3), 1)
+
+    def best_ticket(self, size: int, tiebreak: np.ndarray) -> np.ndarray:
+        """
+        Construye un boleto de `size` posiciones de forma voraz. `tiebreak`
+        (valores en [0, 1)) decide entre candidatos con la misma ganancia.
+        """
+        candidates = np.arange(self.n, dtype=np.uint64)
+        # Primer número: el que más parejas sin cubrir tiene
+        uncovered = popcount((~self.pairs & self.full) ^ self.bits).astype(float)
+        chosen = [int(np.argmax(uncovered + tiebreak))]
+        while len(chosen) < size:
+            picked = np.asarray(chosen)
+            # Parejas (c, k) sin cubrir para cada candidato k
+            pair_hits = (self.pairs[picked][:, None] >> candidates[None, :]) & np.uint64(1)
+            gain = PAIR_WEIGHT * (len(chosen) - pair_hits.sum(axis=0, dtype=np.int64))
+            if len(chosen) > 1:
+                a, b = _PAIRS_OF[len(chosen)]
+                trio_hits = (self.triples[picked[a], picked[b]][:, None] >> candidates[None, :]) & np.uint64(1)
+                gain = gain + (len(a) - trio_hits.sum(axis=0, dtype=np.int64))
+            key = gain + tiebreak
+            key[picked] = -np.inf
+            chosen.append(int(np.argmax(key)))
+        return np.sort(np.asarray(chosen, dtype=np.int64))
+
+
+def iter_cover_combinations(numbers: np.ndarray, weights: np.ndarray, n_combinations: int,
+                            rng: Optional[np.random.Generator] = None,
+                            size: int = COMBINATION_SIZE,
+                            chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[np.ndarray]:
+    """
+    Genera por bloques hasta `n_combinations` combinaciones distintas que
+    maximizan la cobertura de parejas y tríos de `numbers`.
+
+    Cuando un boleto ya no aporta nada nuevo la cobertura se reinicia (otra
+    capa completa). Si el voraz repite un boleto, se sustituye por uno
+    ponderado por `weights` que aún no haya salido. Pasados
+    MAX_COVER_COMBINATIONS boletos, el resto sale de iter_combinations con el
+    mismo mapa de bits de ya emitidas.
+    """
+    numbers = np.asarray(numbers)
+    weights = np.asarray(weights, dtype=float)
+    n = len(numbers)
+    if n < size or n_combinations <= 0:
+        return
+    rng = rng if rng is not None else np.random.default_rng()
+    target = min(n_combinations, comb(n, size))
+    tracker = CoverageTracker(n)
+    span = np.ptp(weights)
+    scaled = (weights - weights.min()) / span if span > 0 else np.zeros(n)
+
+    seen = CombinationBitmap(n, size)
+    greedy = min(target, MAX_COVER_COMBINATIONS)
+    block = []
+    emitted = 0
+    while emitted < greedy:
+        # Score y un poco de azar deciden los empates (variedad entre capas)
+        tiebreak = 0.5 * scaled + 0.49 * rng.random(n)
+        ticket = tracker.best_ticket(size, tiebreak)
+        if tracker.add(ticket) == 0:
+            tracker.reset()
+            ticket = tracker.best_ticket(size, tiebreak)
+            tracker.add(ticket)
+        rank = seen.rank(ticket)
+        if not seen.fresh(rank):
+            ticket = _fresh_weighted(weights, size, rng, seen)
+            if ticket is None:
+                break
+            tracker.add(ticket)
+            rank = seen.rank(ticket)
+        seen.add(rank)
+        block.append(ticket)
+        emitted += 1
+        if len(block) >= chunk_size:
+            yield np.sort(numbers[np.asarray(block)], axis=1)
+            block = []
+    if block:
+        yield np.sort(numbers[np.asarray(block)], axis=1)
+    if emitted == greedy < target:
+        yield from iter_combinations(numbers, weights, target - emitted, rng, size, chunk_size, seen)
+
+
+def _fresh_weighted(weights: np.ndarray, size: int, rng: np.random.Generator,
+                    seen: CombinationBitmap) -> Optional[np.ndarray]:
+    """Primer boleto ponderado que no esté en `seen` (None si no aparece)."""
+    for _ in range(MAX_ROUNDS):
+        rows = np.sort(gumbel_top_k(weights, REPLACEMENT_ROWS, size, rng), axis=1)
+        fresh = np.flatnonzero(seen.fresh(seen.rank(rows)))
+        if len(fresh):
+            return rows[fresh[0]]
+    return None
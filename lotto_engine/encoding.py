@@ -0,0 +1,32 @@
+"""Serialización JSON directa desde arrays del motor (orjson si está instalado)."""
+
+import json
+from typing import Any
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependencia opcional
+    orjson = None
+
+HAS_ORJSON = orjson is not None
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Tipo no serializable: {type(obj).__name__}")
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    JSON compacto en bytes. Acepta arrays NumPy sin convertirlos antes a
+    listas; con orjson se serializan directamente desde su buffer.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, default=_default, separators=(",", ":"),
+                      ensure_ascii=False).encode("utf-8")
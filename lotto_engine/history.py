@@ -0,0 +1,148 @@
+"""Índice de sorteos históricos como máscaras de bits (bit n-1 -> número n)."""
+
+from dataclasses import dataclass
+from functools import cached_property
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+from .sampling import COMBINATION_SIZE, encode_combinations
+
+# Categorías de acierto de la Primitiva, mutuamente excluyentes
+MATCH_CATEGORIES = ['6', '5+C', '5', '4', '3']
+# Boletos por pasada: acota la matriz (boletos × sorteos) a unos pocos MB
+TICKET_CHUNK_SIZE = 512
+# Código por (boleto, sorteo): 2 * aciertos + complementario, de 0 a 13
+_CODES = 2 * (COMBINATION_SIZE + 1)
+# Códigos de cada categoría de MATCH_CATEGORIES
+_CATEGORY_CODES = [[12, 13], [11], [10], [8, 9], [6, 7]]
+
+_M1 = np.uint64(0x5555555555555555)
+_M2 = np.uint64(0x3333333333333333)
+_M4 = np.uint64(0x0F0F0F0F0F0F0F0F)
+_H01 = np.uint64(0x0101010101010101)
+
+
+def popcount(x: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Número de bits activos de cada uint64.
+    SWAR en sitio sobre `out` (o una copia) si numpy no trae bitwise_count.
+    """
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(x, out=out)
+    if out is None:
+        out = x.copy()
+    elif out is not x:
+        np.copyto(out, x)
+    tmp = np.right_shift(out, np.uint64(1))
+    tmp &= _M1
+    out -= tmp
+    np.right_shift(out, np.uint64(2), out=tmp)
+    tmp &= _M2
+    out &= _M2
+    out += tmp
+    np.right_shift(out, np.uint64(4), out=tmp)
+    out += tmp
+    out &= _M4
+    out *= _H01
+    out >>= np.uint64(56)
+    return out
+
+
+def _column_masks(df: 'pd.DataFrame', columns: List[str]) -> np.ndarray:
+    """OR de los bits de las columnas indicadas; valores vacíos o fuera de rango no cuentan."""
+    import pandas as pd
+    values = df[columns].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+    valid = (values >= 1) & (values <= 49)
+    shifts = np.where(valid, values - 1, 0).astype(np.uint64)
+    bits = np.where(valid, np.left_shift(np.uint64(1), shifts), np.uint64(0))
+    return np.bitwise_or.reduce(bits, axis=1).astype(np.uint64)
+
+
+@dataclass(frozen=True)
+class DrawIndex:
+    """Máscaras de la combinación ganadora (N1-N6) y del complementario (C)."""
+    masks: np.ndarray
+    comp_masks: np.ndarray
+
+    @classmethod
+    def from_dataframe(cls, df: 'pd.DataFrame') -> 'DrawIndex':
+        if df.empty:
+            empty = np.empty(0, dtype=np.uint64)
+            return cls(masks=empty, comp_masks=empty)
+        masks = _column_masks(df, ['N1', 'N2', 'N3', 'N4', 'N5', 'N6'])
+        comp_masks = _column_masks(df, ['C'])
+        masks.flags.writeable = False
+        comp_masks.flags.writeable = False
+        return cls(masks=masks, comp_masks=comp_masks)
+
+    def __len__(self) -> int:
+        return len(self.masks)
+
+    def concat(self, other: 'DrawIndex') -> 'DrawIndex':
+        """Índice con los sorteos de este seguidos de los de `other`."""
+        masks = np.concatenate([self.masks, other.masks])
+        comp_masks = np.concatenate([self.comp_masks, other.comp_masks])
+        masks.flags.writeable = False
+        comp_masks.flags.writeable = False
+        return DrawIndex(masks=masks, comp_masks=comp_masks)
+
+    @cached_property
+    def _code_matrix(self) -> np.ndarray:
+        """(49 × sorteos) float32: 2 si el número salió en N1-N6, 1 si fue el complementario."""
+        shifts = np.arange(49, dtype=np.uint64)[:, None]
+        numbers = (self.masks[None, :] >> shifts) & np.uint64(1)
+        comp = (self.comp_masks[None, :] >> shifts) & np.uint64(1)
+        return (2 * numbers + comp).astype(np.float32)
+
+    def match_counts(self, combinations: np.ndarray) -> np.ndarray:
+        """
+        Histograma de aciertos contra todo el histórico.
+        Devuelve una matriz (boletos × MATCH_CATEGORIES).
+
+        Un producto one-hot (boletos × 49) @ (49 × sorteos) da, por pareja,
+        2 * aciertos + complementario; las parejas con premio (3 o más
+        aciertos, pocas) se reparten en categorías con un único bincount.
+        """
+        combinations = np.asarray(combinations, dtype=np.int64)
+        n = len(combinations)
+        histogram = np.zeros(n * _CODES, dtype=np.int64)
+        if n and len(self.masks):
+            matrix = self._code_matrix
+            for start in range(0, n, TICKET_CHUNK_SIZE):
+                chunk = combinations[start:start + TICKET_CHUNK_SIZE]
+                one_hot = np.zeros((len(chunk), 49), dtype=np.float32)
+                np.put_along_axis(one_hot, chunk - 1, 1.0, axis=1)
+                codes = one_hot @ matrix
+                prized = np.flatnonzero(codes >= _CATEGORY_CODES[-1][0])
+                rows = prized // codes.shape[1] + start
+                histogram += np.bincount(rows * _CODES + codes.ravel()[prized].astype(np.int64),
+                                         minlength=n * _CODES)
+        histogram = histogram.reshape(n, _CODES)
+        return np.stack([histogram[:, c].sum(axis=1) for c in _CATEGORY_CODES], axis=1)
+
+    def check(self, combinations: List[List[int]]) -> List[Dict[str, int]]:
+        """Valida los boletos y devuelve un histograma por boleto."""
+        combos = validate_combinations(combinations)
+        counts = self.match_counts(combos)
+        return [dict(zip(MATCH_CATEGORIES, row)) for row in counts.tolist()]
+
+
+def validate_combinations(combinations: List[List[int]]) -> np.ndarray:
+    """Convierte a matriz (n × 6); lanza ValueError si algún boleto no es válido."""
+    if not combinations:
+        raise ValueError("Se requiere al menos una combinación")
+    if any(len(combo) != COMBINATION_SIZE for combo in combinations):
+        raise ValueError(f"Cada combinación debe tener {COMBINATION_SIZE} números")
+    try:
+        combos = np.asarray(combinations, dtype=np.int64)
+    except (OverflowError, TypeError, ValueError):
+        raise ValueError("Los números deben estar entre 1 y 49")
+    if combos.min() < 1 or combos.max() > 49:
+        raise ValueError("Los números deben estar entre 1 y 49")
+    if (popcount(encode_combinations(combos)) != COMBINATION_SIZE).any():
+        raise ValueError("Las combinaciones no pueden repetir números")
+    return combos
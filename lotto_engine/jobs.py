@@ -0,0 +1,178 @@
+"""
+Reentrenamientos en un pool de procesos, fuera del worker que sirve peticiones.
+
+Cada petición de reentrenamiento crea un trabajo con id propio; si ya hay uno
+en curso se devuelve ese (deduplicación). Al terminar, el snapshot resultante
+se entrega al callback de publicación (cambio atómico de referencia).
+
+Los registros de los trabajos viven en un JobRegistry: en memoria para un solo
+proceso, o en el directorio compartido (SharedJobRegistry, en shared.py) para
+que el estado y la deduplicación valgan en todos los workers de uvicorn.
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .metrics import RETRAIN_JOBS
+from .persistence import save_snapshot
+from .scorers import load_scorer
+from .snapshot import EngineSnapshot, build_snapshot
+
+logger = logging.getLogger(__name__)
+
+# Trabajos terminados que se conservan para consultar su estado
+MAX_FINISHED_JOBS = 50
+
+
+def build_engine_snapshot(csv_file: str, model_dir: str,
+                          previous: Optional[EngineSnapshot] = None,
+                          snapshot_file: Optional[str] = None) -> EngineSnapshot:
+    """
+    Tarea del proceso hijo: carga el scorer y construye el snapshot completo.
+    Con `snapshot_file`, también lo deja en disco para los próximos arranques.
+    La duración de la construcción viaja en `snapshot.build_seconds`.
+    """
+    snapshot = build_snapshot(csv_file, previous=previous, scorer=load_scorer(model_dir))
+    if snapshot_file:
+        save_snapshot(snapshot, snapshot_file)
+    return snapshot
+
+
+# Campos de un trabajo que devuelve la API
+PUBLIC_FIELDS = ("job_id", "status", "submitted_at", "finished_at", "version", "error")
+
+JobRecord = Dict[str, Any]
+
+
+def new_job_record() -> JobRecord:
+    """Registro de un trabajo recién lanzado por este proceso."""
+    return {
+        "job_id": uuid.uuid4().hex,
+        "status": "running",
+        "submitted_at": datetime.now().isoformat(),
+        "finished_at": None,
+        "version": None,
+        "error": None,
+        "pid": os.getpid(),
+    }
+
+
+def public_record(record: JobRecord) -> JobRecord:
+    return {key: record.get(key) for key in PUBLIC_FIELDS}
+
+
+def prune_finished(jobs: "OrderedDict[str, JobRecord]") -> None:
+    """Descarta los trabajos terminados más antiguos por encima de MAX_FINISHED_JOBS."""
+    while len(jobs) > MAX_FINISHED_JOBS and next(iter(jobs.values()))["finished_at"] is not None:
+        jobs.popitem(last=False)
+
+
+class JobRegistry:
+    """Registros de trabajos de un solo proceso (sin workers adicionales)."""
+
+    def __init__(self):
+        self._jobs: "OrderedDict[str, JobRecord]" = OrderedDict()
+        self._active: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def claim(self, record: JobRecord) -> Tuple[JobRecord, bool]:
+        """
+        Registra `record` como trabajo activo salvo que ya haya uno en curso.
+        Devuelve el trabajo activo y si es `record` (False = deduplicado).
+        """
+        with self._lock:
+            active = self._jobs.get(self._active) if self._active else None
+            if active is not None and active["finished_at"] is None:
+                return dict(active), False
+            self._jobs[record["job_id"]] = dict(record)
+            self._active = record["job_id"]
+            prune_finished(self._jobs)
+            return record, True
+
+    def finish(self, job_id: str, **fields: Any) -> None:
+        """Marca el trabajo como terminado con `fields` (status, version, error)."""
+        with self._lock:
+            record = self._jobs.get(job_id)
+            if record is not None:
+                record.update(fields, finished_at=datetime.now().isoformat())
+
+    def get(self, job_id: str) -> Optional[JobRecord]:
+        with self._lock:
+            record = self._jobs.get(job_id)
+            return dict(record) if record is not None else None
+
+
+class RetrainJobManager:
+    """Lanza reentrenamientos en un proceso aparte y publica el resultado."""
+
+    def __init__(self, publish: Callable[[EngineSnapshot], None], max_workers: int = 1,
+                 registry: Optional[JobRegistry] = None):
+        self._publish = publish
+        self._max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._registry = registry if registry is not None else JobRegistry()
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: no se hereda el estado (hilos, sockets) del worker de uvicorn
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self._max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def submit(self, fn: Callable[..., EngineSnapshot], *args) -> Tuple[JobRecord, bool]:
+        """
+        Lanza `fn(*args)` salvo que ya haya un trabajo activo (en cualquier
+        worker si el registro es compartido). Devuelve el trabajo y si es
+        nuevo (False = deduplicado).
+        """
+        job, created = self._registry.claim(new_job_record())
+        if not created:
+            RETRAIN_JOBS.inc(status="deduplicated")
+            return public_record(job), False
+        try:
+            future = self._pool().submit(fn, *args)
+        except Exception as e:
+            self._registry.finish(job["job_id"], status="failed", error=str(e) or type(e).__name__)
+            raise
+        RETRAIN_JOBS.inc(status="submitted")
+        future.add_done_callback(lambda done: self._finish(job["job_id"], done))
+        return public_record(job), True
+
+    def _finish(self, job_id: str, future: Future) -> None:
+        try:
+            snapshot = future.result()
+            self._publish(snapshot)
+        except Exception as e:
+            if isinstance(e, BrokenProcessPool):
+                # El proceso hijo murió: el siguiente trabajo crea un pool nuevo
+                with self._lock:
+                    self._executor = None
+            error = str(e) or type(e).__name__
+            self._registry.finish(job_id, status="failed", error=error)
+            RETRAIN_JOBS.inc(status="failed")
+            logger.error(f"Reentrenamiento {job_id} fallido: {error}")
+        else:
+            self._registry.finish(job_id, status="completed", version=snapshot.version)
+            RETRAIN_JOBS.inc(status="completed")
+            logger.info(f"Reentrenamiento {job_id} completado (snapshot {snapshot.version})")
+
+    def get(self, job_id: str) -> Optional[JobRecord]:
+        job = self._registry.get(job_id)
+        return public_record(job) if job is not None else None
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,212 @@
+"""
+Snapshot binario precalculado para arrancar la API sin pandas ni CSV.
+
+Formato (un solo archivo):
+    b'LOTTOSNP'            magic (8 bytes)
+    uint64 little-endian   longitud de la cabecera JSON
+    cabecera JSON          versión de formato, hash de origen, scorer, pesos,
+                           agregados escalares y tabla de arrays
+                           (nombre -> dtype, shape, offset)
+    arrays                 datos crudos alineados a 64 bytes, mapeables con
+                           np.memmap sin copia
+"""
+
+import json
+import logging
+import os
+import struct
+from dataclasses import asdict
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from .aggregates import Aggregates
+from .history import DrawIndex
+from .scorers import load_scorer
+from .snapshot import EngineSnapshot, FusionWeights, build_snapshot
+from .stats import DrawStatistics
+from .store import DrawStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SNAPSHOT_FILE = "data/engine_snapshot.bin"
+MAGIC = b'LOTTOSNP'
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+_PREFIX = struct.Struct('<8sQ')
+
+
+def _align(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _snapshot_arrays(snapshot: EngineSnapshot) -> Dict[str, np.ndarray]:
+    return {
+        'counts': snapshot.counts,
+        'stat_vector': snapshot.stat_vector,
+        'lstm_vector': snapshot.lstm_vector,
+        'scores': snapshot.scores,
+        'ranking': snapshot.ranking,
+        'draws.masks': snapshot.draws.masks,
+        'draws.comp_masks': snapshot.draws.comp_masks,
+        'statistics.dates': snapshot.statistics.dates,
+        'statistics.prefix': snapshot.statistics.prefix,
+        'statistics.decayed': snapshot.statistics.decayed,
+        'store.dates': snapshot.store.dates,
+        'store.dow': snapshot.store.dow,
+        'store.numbers': snapshot.store.numbers,
+        'store.comp': snapshot.store.comp,
+        'store.reintegro': snapshot.store.reintegro,
+        'store.joker': snapshot.store.joker,
+        'aggregates.dow_counts': snapshot.aggregates.dow_counts,
+        'aggregates.number_counts': snapshot.aggregates.number_counts,
+    }
+
+
+def save_snapshot(snapshot: EngineSnapshot, path: str) -> None:
+    """Escribe el snapshot de forma atómica (archivo temporal + os.replace)."""
+    arrays = {name: np.ascontiguousarray(arr) for name, arr in _snapshot_arrays(snapshot).items()}
+    table, offset = {}, 0
+    for name, arr in arrays.items():
+        offset = _align(offset)
+        table[name] = {'dtype': arr.dtype.str, 'shape': list(arr.shape), 'offset': offset}
+        offset += arr.nbytes
+
+    aggregates = snapshot.aggregates
+    header = json.dumps({
+        'format_version': FORMAT_VERSION,
+        'version': snapshot.version,
+        'source_hash': snapshot.source_hash,
+        'scorer': snapshot.scorer,
+        'n_draws': snapshot.n_draws,
+        'created_at': snapshot.created_at.isoformat(),
+        'build_seconds': snapshot.build_seconds,
+        'weights': asdict(snapshot.weights),
+        'half_life': snapshot.statistics.half_life,
+        'aggregates': {
+            'total': aggregates.total,
+            'first_date': str(aggregates.first_date) if aggregates.first_date is not None else None,
+            'last_date': str(aggregates.last_date) if aggregates.last_date is not None else None,
+        },
+        'arrays': table,
+    }).encode('utf-8')
+    data_start = _align(_PREFIX.size + len(header))
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, 'wb') as f:
+        f.write(_PREFIX.pack(MAGIC, len(header)))
+        f.write(header)
+        for name, arr in arrays.items():
+            f.seek(data_start + table[name]['offset'])
+            f.write(arr.tobytes())
+    os.replace(tmp_path, path)
+
+
+def read_header(path: str) -> Dict[str, Any]:
+    """Cabecera del snapshot; ValueError si el archivo no tiene el formato esperado."""
+    with open(path, 'rb') as f:
+        magic, header_len = _PREFIX.unpack(f.read(_PREFIX.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} no es un snapshot del motor")
+        header = json.loads(f.read(header_len))
+    if header.get('format_version') != FORMAT_VERSION:
+        raise ValueError(f"Versión de formato no soportada: {header.get('format_version')}")
+    header['data_start'] = _align(_PREFIX.size + header_len)
+    return header
+
+
+def _map_arrays(path: str, header: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """Arrays del snapshot sin copiarlos; ValueError si el archivo está truncado."""
+    size = os.path.getsize(path)
+    arrays = {}
+    for name, spec in header['arrays'].items():
+        dtype, shape = np.dtype(spec['dtype']), tuple(spec['shape'])
+        end = header['data_start'] + spec['offset'] + dtype.itemsize * int(np.prod(shape))
+        if end > size:
+            raise ValueError(f"{path} truncado: '{name}' acaba en el byte {end} y el archivo tiene {size}")
+        if 0 in shape:
+            arrays[name] = np.empty(shape, dtype=dtype)
+        else:
+            arrays[name] = np.memmap(path, mode='r', dtype=dtype, shape=shape,
+                                     offset=header['data_start'] + spec['offset'])
+    return arrays
+
+
+def snapshot_from_arrays(header: Dict[str, Any], arrays: Dict[str, np.ndarray]) -> EngineSnapshot:
+    """Reconstruye un EngineSnapshot a partir de su cabecera y sus arrays (sin copiarlos)."""
+    agg = header['aggregates']
+    return EngineSnapshot(
+        source_hash=header['source_hash'],
+        scorer=header['scorer'],
+        n_draws=header['n_draws'],
+        counts=arrays['counts'],
+        stat_vector=arrays['stat_vector'],
+        lstm_vector=arrays['lstm_vector'],
+        weights=FusionWeights(**header['weights']),
+        scores=arrays['scores'],
+        ranking=arrays['ranking'],
+        draws=DrawIndex(masks=arrays['draws.masks'], comp_masks=arrays['draws.comp_masks']),
+        statistics=DrawStatistics.from_arrays(
+            arrays['statistics.dates'], arrays['statistics.prefix'],
+            arrays['statistics.decayed'], header['half_life'],
+        ),
+        store=DrawStore(
+            dates=arrays['store.dates'],
+            dow=arrays['store.dow'],
+            numbers=arrays['store.numbers'],
+            comp=arrays['store.comp'],
+            reintegro=arrays['store.reintegro'],
+            joker=arrays['store.joker'],
+        ),
+        aggregates=Aggregates(
+            total=agg['total'],
+            first_date=np.datetime64(agg['first_date'], 'D') if agg['first_date'] else None,
+            last_date=np.datetime64(agg['last_date'], 'D') if agg['last_date'] else None,
+            dow_counts=arrays['aggregates.dow_counts'],
+            number_counts=arrays['aggregates.number_counts'],
+        ),
+        created_at=datetime.fromisoformat(header['created_at']),
+        build_seconds=header.get('build_seconds', 0.0),
+    )
+
+
+def load_snapshot(path: str, source_hash: Optional[str] = None,
+                  scorer: Optional[str] = None) -> Optional[EngineSnapshot]:
+    """
+    Mapea el snapshot en memoria. Devuelve None si falta, está corrupto o no
+    corresponde al CSV (`source_hash`) o al modelo (`scorer`) actuales.
+    """
+    if not os.path.exists(path):
+        logger.info(f"No hay snapshot precalculado en {path}")
+        return None
+    try:
+        header = read_header(path)
+    except (OSError, ValueError, struct.error) as e:
+        logger.warning(f"Snapshot {path} ilegible: {e}")
+        return None
+    if source_hash is not None and header['source_hash'] != source_hash:
+        logger.info(f"Snapshot {path} desactualizado respecto al CSV")
+        return None
+    if scorer is not None and header['scorer'] != scorer:
+        logger.info(f"Snapshot {path} generado con otro modelo ({header['scorer']})")
+        return None
+    try:
+        return snapshot_from_arrays(header, _map_arrays(path, header))
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logger.warning(f"Snapshot {path} ilegible: {e}")
+        return None
+
+
+def export_snapshot(csv_file: str, output_file: str = DEFAULT_SNAPSHOT_FILE,
+                    model_dir: str = "models") -> EngineSnapshot:
+    """
+    Construye el snapshot desde el CSV limpio y lo guarda en disco (paso del
+    pipeline). El snapshot anterior, si existe, permite procesar solo los
+    sorteos nuevos.
+    """
+    previous = load_snapshot(output_file)
+    snapshot = build_snapshot(csv_file, previous=previous, scorer=load_scorer(model_dir))
+    save_snapshot(snapshot, output_file)
+    return snapshot
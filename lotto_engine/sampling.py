@@ -0,0 +1,206 @@
+"""Generación vectorizada de combinaciones ponderadas por score."""
+
+from math import comb
+from typing import Iterator, List, Optional, Sequence
+
+import numpy as np
+
+COMBINATION_SIZE = 6
+# Filas por bloque: acota la matriz de claves (bloque × top_n) en memoria
+DEFAULT_CHUNK_SIZE = 65536
+MIN_ROWS = 256
+MAX_ROUNDS = 16
+
+
+def encode_combinations(combos: np.ndarray) -> np.ndarray:
+    """Codifica cada combinación (fila de números 1-49) como máscara de 49 bits."""
+    bits = np.left_shift(np.uint64(1), combos.astype(np.uint64) - np.uint64(1))
+    return np.bitwise_or.reduce(bits, axis=1)
+
+
+def decode_combinations(codes: np.ndarray, size: int = COMBINATION_SIZE) -> np.ndarray:
+    """Inverso de encode_combinations: filas ordenadas de números."""
+    shifts = np.arange(49, dtype=np.uint64)
+    present = (codes[:, None] >> shifts) & np.uint64(1)
+    _, cols = np.nonzero(present)
+    return (cols + 1).reshape(len(codes), size)
+
+
+def gumbel_top_k(weights: np.ndarray, n_rows: int, k: int,
+                 rng: np.random.Generator) -> np.ndarray:
+    """
+    Muestreo sin reemplazo proporcional a `weights` (Gumbel top-k).
+    Devuelve índices (n_rows × k) sobre `weights`.
+
+    Usa la forma equivalente con exponenciales: los k menores de E / w, con
+    E ~ Exp(1), son los k mayores de log(w) + Gumbel.
+    """
+    with np.errstate(divide='ignore'):
+        inv_w = (1.0 / np.asarray(weights, dtype=np.float32)).clip(0, None)
+    keys = rng.standard_exponential(size=(n_rows, len(weights)), dtype=np.float32)
+    keys *= inv_w
+    return np.argpartition(keys, k - 1, axis=1)[:, :k]
+
+
+def _rank_table(n: int, size: int) -> np.ndarray:
+    """Tabla comb(i, j) para i < n, j <= size (sistema combinatorio)."""
+    return np.array([[comb(i, j) for j in range(size + 1)] for i in range(n)], dtype=np.int64)
+
+
+class CombinationBitmap:
+    """
+    Combinaciones de `size` posiciones entre `n` ya emitidas, en un mapa de
+    bits indexado por su rango combinatorio: comb(n, size) bits (1.75 MB con
+    49 números) sea cual sea el número de combinaciones.
+    """
+
+    def __init__(self, n: int, size: int):
+        self.ranks = _rank_table(n, size)
+        self.cols = np.arange(1, size + 1)
+        self.bits = np.zeros((comb(n, size) + 7) // 8, dtype=np.uint8)
+
+    def rank(self, idx: np.ndarray) -> np.ndarray:
+        """Rango de cada fila de posiciones ordenadas (o de una sola fila)."""
+        return self.ranks[idx, self.cols].sum(axis=-1)
+
+    def fresh(self, rank: np.ndarray) -> np.ndarray:
+        """True para los rangos que aún no se han marcado."""
+        return ((self.bits[rank >> 3] >> (rank & 7).astype(np.uint8)) & 1) == 0
+
+    def add(self, rank: np.ndarray) -> None:
+        np.bitwise_or.at(self.bits, rank >> 3, np.left_shift(1, rank & 7).astype(np.uint8))
+
+
+def iter_combinations(numbers: np.ndarray, weights: np.ndarray, n_combinations: int,
+                      rng: Optional[np.random.Generator] = None,
+                      size: int = COMBINATION_SIZE,
+                      chunk_size: int = DEFAULT_CHUNK_SIZE,
+                      seen: Optional[CombinationBitmap] = None) -> Iterator[np.ndarray]:
+    """
+    Genera por bloques hasta `n_combinations` combinaciones distintas de
+    `size` números tomados de `numbers`, ponderadas por `weights`.
+
+    Cada bloque (como mucho `chunk_size` filas) se resuelve en una llamada
+    vectorizada. Las ya emitidas se recuerdan en un CombinationBitmap; `seen`
+    permite continuar uno ya usado (sin repetir sus combinaciones).
+    """
+    numbers = np.asarray(numbers)
+    weights = np.asarray(weights, dtype=float)
+    if len(numbers) < size or n_combinations <= 0:
+        return
+    rng = rng if rng is not None else np.random.default_rng()
+    total = comb(len(numbers), size)
+    target = min(n_combinations, total)
+    seen = seen if seen is not None else CombinationBitmap(len(numbers), size)
+
+    emitted = 0
+    # Con pesos muy concentrados casi todo sale repetido: se abandona tras
+    # MAX_ROUNDS bloques seguidos con menos de un 1% de combinaciones nuevas
+    stalled = 0
+    while emitted < target and stalled < MAX_ROUNDS:
+        missing = target - emitted
+        # Sobremuestreo ligero para compensar los duplicados esperados
+        n_rows = min(max(missing + missing // 4, MIN_ROWS), chunk_size)
+        idx = np.sort(gumbel_top_k(weights, n_rows, size, rng), axis=1)
+
+        rank = seen.rank(idx)
+        _, first = np.unique(rank, return_index=True)
+        first.sort()  # conserva el orden de aparición
+        rank = rank[first]
+        fresh = seen.fresh(rank)
+        first, rank = first[fresh][:missing], rank[fresh][:missing]
+        stalled = stalled + 1 if len(first) * 100 < n_rows else 0
+        if not len(first):
+            continue
+        seen.add(rank)
+        emitted += len(first)
+        yield np.sort(numbers[idx[first]], axis=1)
+
+
+def sample_combinations(numbers: np.ndarray, weights: np.ndarray, n_combinations: int,
+                        rng: Optional[np.random.Generator] = None,
+                        size: int = COMBINATION_SIZE,
+                        chunk_size: int = DEFAULT_CHUNK_SIZE) -> np.ndarray:
+    """
+    Igual que iter_combinations pero devuelve todas las combinaciones en una
+    sola matriz. Si se piden más de las posibles, se devuelven todas las
+    distintas encontradas.
+    """
+    chunks = list(iter_combinations(numbers, weights, n_combinations, rng, size, chunk_size))
+    if not chunks:
+        return np.empty((0, size), dtype=np.asarray(numbers).dtype)
+    return np.concatenate(chunks)
+
+
+def sample_combination_sets(numbers: Sequence[np.ndarray], weights: Sequence[np.ndarray],
+                            counts: Sequence[int], rngs: Sequence[np.random.Generator],
+                            size: int = COMBINATION_SIZE,
+                            chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[np.ndarray]:
+    """
+    Varias llamadas a sample_combinations resueltas a la vez. En cada ronda
+    las claves de todas las peticiones pendientes van en una única matriz
+    (rellena con NaN hasta el candidato más largo) y la selección, el rango
+    combinatorio y los duplicados se resuelven en una sola pasada.
+
+    Cada petición consume su generador igual que sample_combinations, así que
+    con la misma semilla devuelve las mismas combinaciones.
+    """
+    m = len(numbers)
+    numbers = [np.asarray(nums) for nums in numbers]
+    result = [np.empty((0, size), dtype=nums.dtype) for nums in numbers]
+    width = max((len(nums) for nums in numbers), default=0)
+    if width < size:
+        return result
+    ranks = _rank_table(width, size)
+    cols = np.arange(1, size + 1)
+    space = comb(width, size)
+
+    inv_w = []
+    for w in weights:
+        with np.errstate(divide='ignore'):
+            inv_w.append((1.0 / np.asarray(w, dtype=np.float32)).clip(0, None))
+    target = [min(max(n, 0), comb(len(nums), size)) if len(nums) >= size else 0
+              for n, nums in zip(counts, numbers)]
+    chunks: List[List[np.ndarray]] = [[] for _ in range(m)]
+    emitted = [0] * m
+    stalled = [0] * m
+    # Claves (petición, rango) ya aceptadas, ordenadas
+    accepted = np.empty(0, dtype=np.int64)
+
+    while True:
+        active = [i for i in range(m) if emitted[i] < target[i] and stalled[i] < MAX_ROUNDS]
+        if not active:
+            break
+        rows = []
+        for i in active:
+            missing = target[i] - emitted[i]
+            n_rows = min(max(missing + missing // 4, MIN_ROWS), chunk_size)
+            keys = np.full((n_rows, width), np.nan, dtype=np.float32)
+            block = keys[:, :len(inv_w[i])]
+            rng_keys = rngs[i].standard_exponential(size=block.shape, dtype=np.float32)
+            np.multiply(rng_keys, inv_w[i], out=block)
+            rows.append(keys)
+        sizes = np.array([len(r) for r in rows])
+        owner = np.repeat(np.asarray(active, dtype=np.int64), sizes)
+        # NaN queda al final: el relleno nunca se elige
+        idx = np.sort(np.argpartition(np.concatenate(rows), size - 1, axis=1)[:, :size], axis=1)
+
+        key = owner * space + ranks[idx, cols].sum(axis=1)
+        _, first = np.unique(key, return_index=True)
+        first.sort()  # conserva el orden de aparición (agrupado por petición)
+        first = first[~np.isin(key[first], accepted, assume_unique=True)]
+        bounds = np.searchsorted(owner[first], active, side='left')
+        ends = np.searchsorted(owner[first], active, side='right')
+
+        taken = []
+        for i, n_rows, lo, hi in zip(active, sizes, bounds, ends):
+            new = first[lo:hi][:target[i] - emitted[i]]
+            stalled[i] = stalled[i] + 1 if len(new) * 100 < n_rows else 0
+            if len(new):
+                emitted[i] += len(new)
+                chunks[i].append(np.sort(numbers[i][idx[new]], axis=1))
+                taken.append(new)
+        if taken:
+            accepted = np.union1d(accepted, key[np.concatenate(taken)])
+
+    return [np.concatenate(c) if c else r for c, r in zip(chunks, result)]
@@ -0,0 +1,184 @@
+"""
+Scorers del componente "LSTM" de la fusión.
+
+Un scorer recibe el histórico cronológico (n × 6) y devuelve un vector de 49
+scores. Se evalúa una sola vez por snapshot, nunca por petición.
+
+Formato de los modelos exportados (`models/lstm_model_{i}.npz`, sin pickle):
+    kernel            (49, 4H)   pesos de entrada del LSTM (gates i, f, c, o)
+    recurrent_kernel  (H, 4H)    pesos recurrentes
+    bias              (4H,)
+    dense_kernel      (H, 49)    capa de salida (sigmoide)
+    dense_bias        (49,)
+    seq_len           ()         sorteos de entrada por predicción
+"""
+
+import hashlib
+import logging
+import os
+from abc import ABC, abstractmethod
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from .constants import NUMBERS
+from .stats import draw_counts
+
+logger = logging.getLogger(__name__)
+
+ENSEMBLE_SIZE = 5
+MODEL_PATTERN = "lstm_model_{}.npz"
+WEIGHT_KEYS = ('kernel', 'recurrent_kernel', 'bias', 'dense_kernel', 'dense_bias')
+# Ventanas por batch en score_history (acota la proyección M × B × T × 4H)
+HISTORY_BATCH_SIZE = 256
+
+
+class Scorer(ABC):
+    """Interfaz de los backends de scoring."""
+
+    @property
+    @abstractmethod
+    def fingerprint(self) -> str:
+        """Identifica el modelo; forma parte de la versión del snapshot."""
+
+    @abstractmethod
+    def score(self, draws: np.ndarray) -> np.ndarray:
+        """Vector de 49 scores a partir del histórico cronológico (n × 6)."""
+
+    def score_history(self, draws: np.ndarray, positions: Sequence[int]) -> np.ndarray:
+        """
+        Scores (len(positions) × 49) tal y como se habrían calculado antes de
+        cada sorteo: la fila i usa solo draws[:positions[i]] (backtesting).
+        """
+        scores = np.zeros((len(positions), len(NUMBERS)))
+        for i, t in enumerate(positions):
+            scores[i] = self.score(draws[:t])
+        return scores
+
+
+class SimulatedScorer(Scorer):
+    """
+    Placeholder sin modelos: scores aleatorios de 0 a 0.5, sembrados con el
+    contenido del histórico para que el snapshot sea reproducible.
+    """
+
+    fingerprint = "simulated"
+
+    def score(self, draws: np.ndarray) -> np.ndarray:
+        seed = hashlib.sha256(np.ascontiguousarray(draws).tobytes()).digest()
+        rng = np.random.default_rng(int.from_bytes(seed[:8], 'little'))
+        return rng.random(len(NUMBERS)) * 0.5
+
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    return 0.5 * (np.tanh(0.5 * x) + 1.0)
+
+
+class NumpyLSTMEnsemble(Scorer):
+    """
+    Inferencia en CPU del ensemble LSTM con NumPy, sin framework de deep learning.
+    Los miembros con la misma arquitectura se evalúan juntos en un solo batch.
+    """
+
+    def __init__(self, members: List[Dict[str, np.ndarray]], fingerprint: str):
+        if not members:
+            raise ValueError("El ensemble necesita al menos un modelo")
+        seq_lens = {int(m['seq_len']) for m in members}
+        if len(seq_lens) != 1:
+            raise ValueError("Todos los modelos deben usar la misma longitud de secuencia")
+        self.seq_len = seq_lens.pop()
+        self._fingerprint = fingerprint
+        # Agrupar por forma para apilar pesos (M, ...) y evaluar en batch
+        groups: Dict[tuple, List[Dict[str, np.ndarray]]] = {}
+        for m in members:
+            groups.setdefault(tuple(m[k].shape for k in WEIGHT_KEYS), []).append(m)
+        self._groups = [
+            {k: np.stack([m[k] for m in group]).astype(np.float32) for k in WEIGHT_KEYS}
+            for group in groups.values()
+        ]
+        self.size = len(members)
+
+    @classmethod
+    def from_directory(cls, model_dir: str, size: int = ENSEMBLE_SIZE) -> 'NumpyLSTMEnsemble':
+        members = []
+        digest = hashlib.sha256()
+        for i in range(1, size + 1):
+            path = os.path.join(model_dir, MODEL_PATTERN.format(i))
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+            with np.load(path, allow_pickle=False) as data:
+                members.append({k: data[k] for k in (*WEIGHT_KEYS, 'seq_len')})
+        return cls(members, fingerprint=f"lstm-numpy-{digest.hexdigest()[:12]}")
+
+    @property
+    def fingerprint(self) -> str:
+        return self._fingerprint
+
+    @staticmethod
+    def _forward(weights: Dict[str, np.ndarray], x: np.ndarray) -> np.ndarray:
+        """
+        Paso hacia delante de M modelos sobre B secuencias a la vez; x es
+        (B, T, 49). Devuelve (M, B, 49).
+        """
+        kernel, recurrent = weights['kernel'], weights['recurrent_kernel']
+        n_models, hidden = recurrent.shape[0], recurrent.shape[1]
+        # Proyección de entrada de todos los pasos de una vez: (M, B, T, 4H)
+        projected = np.einsum('btd,mdg->mbtg', x, kernel) + weights['bias'][:, None, None, :]
+        h = np.zeros((n_models, x.shape[0], hidden), dtype=np.float32)
+        c = np.zeros((n_models, x.shape[0], hidden), dtype=np.float32)
+        for t in range(x.shape[1]):
+            z = projected[:, :, t] + np.einsum('mbh,mhg->mbg', h, recurrent)
+            i = _sigmoid(z[..., :hidden])
+            f = _sigmoid(z[..., hidden:2 * hidden])
+            g = np.tanh(z[..., 2 * hidden:3 * hidden])
+            o = _sigmoid(z[..., 3 * hidden:])
+            c = f * c + i * g
+            h = o * np.tanh(c)
+        logits = np.einsum('mbh,mho->mbo', h, weights['dense_kernel']) + weights['dense_bias'][:, None, :]
+        return _sigmoid(logits)
+
+    def _predict(self, x: np.ndarray) -> np.ndarray:
+        """Media del ensemble para B secuencias (B, T, 49) -> (B, 49)."""
+        outputs = np.concatenate([self._forward(w, x) for w in self._groups])
+        return outputs.mean(axis=0).astype(float)
+
+    def score(self, draws: np.ndarray) -> np.ndarray:
+        window = draws[-self.seq_len:]
+        x = draw_counts(window).astype(np.float32)
+        if len(x) < self.seq_len:
+            x = np.vstack([np.zeros((self.seq_len - len(x), len(NUMBERS)), np.float32), x])
+        return self._predict(x[None])[0]
+
+    def score_history(self, draws: np.ndarray, positions: Sequence[int]) -> np.ndarray:
+        """Como Scorer.score_history, con las ventanas evaluadas en batch."""
+        positions = np.asarray(positions, dtype=np.int64)
+        # Relleno de seq_len sorteos vacíos: la ventana de t es padded[t:t + seq_len]
+        onehot = draw_counts(draws).astype(np.float32)
+        padded = np.vstack([np.zeros((self.seq_len, len(NUMBERS)), np.float32), onehot])
+        windows = np.lib.stride_tricks.sliding_window_view(padded, self.seq_len, axis=0)
+        scores = np.zeros((len(positions), len(NUMBERS)))
+        for start in range(0, len(positions), HISTORY_BATCH_SIZE):
+            batch = positions[start:start + HISTORY_BATCH_SIZE]
+            scores[start:start + len(batch)] = self._predict(windows[batch].transpose(0, 2, 1))
+        return scores
+
+
+def export_keras_model(model, path: str, seq_len: int) -> None:
+    """
+    Exporta un modelo Keras LSTM(H) -> Dense(49, sigmoid) al formato .npz.
+    Se ejecuta fuera del worker de la API (donde sí está instalado Keras).
+    """
+    kernel, recurrent_kernel, bias, dense_kernel, dense_bias = model.get_weights()
+    np.savez(path, kernel=kernel, recurrent_kernel=recurrent_kernel, bias=bias,
+             dense_kernel=dense_kernel, dense_bias=dense_bias, seq_len=np.int64(seq_len))
+
+
+def load_scorer(model_dir: str) -> Scorer:
+    """Ensemble NumPy si están los modelos exportados; si no, el placeholder."""
+    paths = [os.path.join(model_dir, MODEL_PATTERN.format(i)) for i in range(1, ENSEMBLE_SIZE + 1)]
+    if all(os.path.exists(p) for p in paths):
+        scorer = NumpyLSTMEnsemble.from_directory(model_dir)
+        logger.info(f"Ensemble LSTM cargado ({scorer.size} modelos, {scorer.fingerprint})")
+        return scorer
+    logger.warning(f"No se encontraron modelos en {model_dir}; usando scores LSTM simulados.")
+    return SimulatedScorer()
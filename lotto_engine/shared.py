@@ -0,0 +1,213 @@
+"""
+Snapshot compartido entre los workers de uvicorn.
+
+Un cargador publica el snapshot una sola vez como segmento binario en memoria
+compartida del sistema (/dev/shm) y todos los workers lo mapean en solo
+lectura, de modo que las páginas existen una vez por máquina. Un archivo
+puntero `current` indica el segmento vigente; un reentrenamiento escribe un
+segmento nuevo y cambia el puntero, y cada worker se mueve a él en su
+siguiente comprobación.
+
+Los trabajos de reentrenamiento se registran en el mismo directorio
+(`jobs.json`, bajo el mismo bloqueo) para que cualquier worker conozca su
+estado y no se lancen dos a la vez.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Optional, Tuple
+
+from .jobs import JobRecord, JobRegistry, prune_finished
+from .persistence import load_snapshot, save_snapshot
+from .snapshot import EngineSnapshot
+
+try:
+    import fcntl
+except ImportError:  # Windows: sin bloqueo entre procesos
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+POINTER_FILE = "current"
+LOCK_FILE = ".lock"
+JOBS_FILE = "jobs.json"
+# Segundos entre comprobaciones del puntero en cada worker
+REFRESH_INTERVAL = 1.0
+
+
+def default_shared_dir(*sources: str) -> str:
+    """
+    Directorio de segmentos: LOTTO_SHARED_DIR, o uno en /dev/shm (o el temporal
+    del sistema) por despliegue, según las rutas absolutas de `sources` (CSV y
+    modelos). Así dos despliegues en la misma máquina no comparten snapshot.
+    """
+    if "LOTTO_SHARED_DIR" in os.environ:
+        return os.environ["LOTTO_SHARED_DIR"]
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    if not sources:
+        return os.path.join(base, "lotto_engine")
+    key = hashlib.sha256("\0".join(os.path.abspath(s) for s in sources).encode('utf-8'))
+    return os.path.join(base, f"lotto_engine-{key.hexdigest()[:16]}")
+
+
+class SharedSnapshotStore:
+    """Publica y adjunta snapshots en segmentos compartidos por todos los workers."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.attached: Optional[str] = None
+        self._next_check = 0.0
+        os.makedirs(directory, exist_ok=True)
+
+    @contextmanager
+    def _locked(self):
+        """Bloqueo exclusivo entre procesos para cargar o publicar."""
+        with open(os.path.join(self.directory, LOCK_FILE), 'a') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _current_segment(self) -> Optional[str]:
+        try:
+            with open(os.path.join(self.directory, POINTER_FILE), encoding='utf-8') as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def _attach(self, segment: str, **expected) -> Optional[EngineSnapshot]:
+        snapshot = load_snapshot(os.path.join(self.directory, segment), **expected)
+        if snapshot is not None:
+            self.attached = segment
+        return snapshot
+
+    def _write(self, snapshot: EngineSnapshot) -> str:
+        """Escribe el segmento, mueve el puntero y borra segmentos antiguos (sin bloqueo)."""
+        segment = f"snapshot-{snapshot.version}-{time.time_ns()}.bin"
+        save_snapshot(snapshot, os.path.join(self.directory, segment))
+        pointer = os.path.join(self.directory, POINTER_FILE)
+        tmp_pointer = f"{pointer}.tmp{os.getpid()}"
+        with open(tmp_pointer, 'w', encoding='utf-8') as f:
+            f.write(segment)
+        os.replace(tmp_pointer, pointer)
+
+        # Se conserva el segmento anterior; los ya mapeados siguen válidos tras borrarse
+        previous = self.attached
+        for name in os.listdir(self.directory):
+            if name.startswith("snapshot-") and name not in (segment, previous):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+        return segment
+
+    def attach_or_build(self, build: Callable[[], EngineSnapshot],
+                        source_hash: str, scorer: str) -> EngineSnapshot:
+        """
+        Adjunta el segmento vigente si corresponde a los datos y al modelo;
+        si no, el primer worker que toma el bloqueo construye y publica, y el
+        resto espera y adjunta ese mismo segmento.
+        """
+        with self._locked():
+            segment = self._current_segment()
+            if segment is not None:
+                snapshot = self._attach(segment, source_hash=source_hash, scorer=scorer)
+                if snapshot is not None:
+                    logger.info(f"Snapshot compartido adjuntado: {segment}")
+                    return snapshot
+            segment = self._write(build())
+            logger.info(f"Snapshot compartido publicado: {segment}")
+            return self._attach(segment)
+
+    def publish(self, snapshot: EngineSnapshot) -> EngineSnapshot:
+        """Publica un snapshot nuevo para todos los workers y lo devuelve mapeado."""
+        with self._locked():
+            segment = self._write(snapshot)
+            return self._attach(segment)
+
+    def refresh(self) -> Optional[EngineSnapshot]:
+        """
+        Comprobación barata (como mucho cada REFRESH_INTERVAL) del puntero.
+        Devuelve el snapshot nuevo si otro worker publicó uno; si no, None.
+        """
+        now = time.monotonic()
+        if now < self._next_check:
+            return None
+        self._next_check = now + REFRESH_INTERVAL
+        segment = self._current_segment()
+        if segment is None or segment == self.attached:
+            return None
+        return self._attach(segment)
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class SharedJobRegistry(JobRegistry):
+    """
+    Registro de trabajos en el directorio compartido: el estado y el trabajo
+    activo se leen y escriben bajo el bloqueo de SharedSnapshotStore. Un
+    trabajo activo cuyo worker ya no existe se da por fallido.
+    """
+
+    def __init__(self, store: SharedSnapshotStore):
+        self.store = store
+        self.path = os.path.join(store.directory, JOBS_FILE)
+
+    def _read(self) -> "Tuple[Optional[str], OrderedDict[str, JobRecord]]":
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                state = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None, OrderedDict()
+        return state.get("active"), OrderedDict(state.get("jobs", []))
+
+    def _save(self, active: Optional[str], jobs: "OrderedDict[str, JobRecord]") -> None:
+        tmp_path = f"{self.path}.tmp{os.getpid()}"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            # Lista de pares: conserva el orden de llegada para podar los antiguos
+            json.dump({"active": active, "jobs": list(jobs.items())}, f)
+        os.replace(tmp_path, self.path)
+
+    def claim(self, record: JobRecord) -> Tuple[JobRecord, bool]:
+        with self.store._locked():
+            active_id, jobs = self._read()
+            active = jobs.get(active_id) if active_id else None
+            if active is not None and active["finished_at"] is None:
+                if _process_alive(active["pid"]):
+                    return active, False
+                active.update(status="failed", error="El worker que lo lanzó terminó",
+                              finished_at=datetime.now().isoformat())
+            jobs[record["job_id"]] = record
+            prune_finished(jobs)
+            self._save(record["job_id"], jobs)
+            return record, True
+
+    def finish(self, job_id: str, **fields: Any) -> None:
+        with self.store._locked():
+            active_id, jobs = self._read()
+            record = jobs.get(job_id)
+            if record is not None:
+                record.update(fields, finished_at=datetime.now().isoformat())
+                self._save(active_id, jobs)
+
+    def get(self, job_id: str) -> Optional[JobRecord]:
+        # Sin bloqueo: el archivo se sustituye de forma atómica
+        return self._read()[1].get(job_id)
@@ -0,0 +1,204 @@
+"""Snapshot inmutable y versionado de los datos del motor de predicción."""
+
+import hashlib
+import io
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .aggregates import Aggregates
+from .constants import NUMBER_COLUMNS, NUMBERS
+from .history import DrawIndex
+from .scorers import Scorer, SimulatedScorer
+from .stats import DrawStatistics
+from .store import DrawStore
+
+_ISO_DATE = re.compile(rb'\d{4}-\d{2}-\d{2}')
+
+
+@dataclass(frozen=True)
+class FusionWeights:
+    """Pesos de la fusión LSTM + estadística (60% + 40% según arquitectura)."""
+    lstm: float = 0.6
+    stat: float = 0.4
+    # Stat score suele ser bajo (ej 0.02); factor de escala para hacerlo comparable
+    stat_scale: float = 10.0
+
+
+def fuse_scores(lstm_vector: np.ndarray, stat_vector: np.ndarray,
+                weights: FusionWeights) -> np.ndarray:
+    """Weighted Fusion vectorizada; admite vectores o matrices (..., 49)."""
+    return (weights.lstm * lstm_vector) + (weights.stat * stat_vector * weights.stat_scale)
+
+
+def top_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Índices de los k mayores scores, ordenados (ordenación parcial con argpartition)."""
+    k = max(0, min(k, len(scores)))
+    if k == 0:
+        return np.empty(0, dtype=np.int64)
+    idx = np.sort(np.argpartition(-scores, k - 1)[:k])
+    return idx[np.argsort(-scores[idx], kind='stable')]
+
+
+def _readonly(arr: np.ndarray) -> np.ndarray:
+    arr.flags.writeable = False
+    return arr
+
+
+@dataclass(frozen=True)
+class EngineSnapshot:
+    """
+    Estado completo y de solo lectura con el que se sirve una predicción.
+    Se construye fuera de línea y se publica con un único cambio de referencia.
+    """
+    source_hash: str
+    scorer: str
+    n_draws: int
+    counts: np.ndarray
+    stat_vector: np.ndarray
+    lstm_vector: np.ndarray
+    weights: FusionWeights
+    scores: np.ndarray
+    ranking: np.ndarray
+    draws: DrawIndex
+    statistics: DrawStatistics
+    store: DrawStore
+    aggregates: Aggregates
+    created_at: datetime = field(default_factory=datetime.now)
+    # Segundos que tardó build_snapshot (viaja con el snapshot a otros procesos)
+    build_seconds: float = 0.0
+
+    @property
+    def version(self) -> str:
+        """Versión: hash del CSV de origen combinado con el modelo que lo puntuó."""
+        return hashlib.sha256(f"{self.source_hash}:{self.scorer}".encode()).hexdigest()[:12]
+
+
+def _grown_rows(raw: bytes, previous: Optional['EngineSnapshot']) -> Optional[Tuple[bytes, bool]]:
+    """
+    Si `raw` es el CSV del snapshot anterior con sorteos posteriores añadidos
+    al principio (orden del más nuevo al más antiguo) o al final, devuelve la
+    cabecera con esas filas y si iban al principio; si no, None.
+
+    Solo se leen las fechas de las filas nuevas; el resto se comprueba con el
+    hash del snapshot anterior, sin parsearlo.
+    """
+    if previous is None or not len(previous.store):
+        return None
+    header_end = raw.find(b'\n') + 1
+    if header_end == 0:
+        return None
+    last = str(previous.store.dates[-1]).encode()
+
+    def is_new(line: bytes) -> bool:
+        date = line[:10]
+        return line[10:11] == b',' and _ISO_DATE.fullmatch(date) is not None and date > last
+
+    # Filas nuevas al principio (orden del raw) ...
+    pos = header_end
+    while pos < len(raw):
+        end = raw.find(b'\n', pos)
+        end = len(raw) if end < 0 else end + 1
+        if not is_new(raw[pos:end]):
+            break
+        pos = end
+    head, rest, at_start = raw[header_end:pos], raw[:header_end] + raw[pos:], True
+    if not head:
+        # ... o al final (orden cronológico)
+        pos = len(raw)
+        while pos > header_end:
+            end = pos - 1 if raw[pos - 1:pos] == b'\n' else pos
+            start = raw.rfind(b'\n', header_end, end) + 1 or header_end
+            if not is_new(raw[start:end]):
+                break
+            pos = start
+        head, rest, at_start = raw[pos:], raw[:pos], False
+    if hashlib.sha256(rest).hexdigest() != previous.source_hash:
+        return None
+    return raw[:header_end] + head, at_start
+
+
+def source_file_hash(csv_file: str) -> str:
+    """sha256 del CSV de origen (el de un archivo vacío si no existe)."""
+    digest = hashlib.sha256()
+    if os.path.exists(csv_file):
+        with open(csv_file, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def build_snapshot(csv_file: str, weights: FusionWeights = FusionWeights(),
+                   previous: Optional[EngineSnapshot] = None,
+                   scorer: Optional[Scorer] = None) -> EngineSnapshot:
+    """
+    Lee el CSV limpio una sola vez y calcula todos los vectores derivados.
+    Con `previous`, si el CSV solo ha crecido con sorteos posteriores, se
+    parsean únicamente las filas nuevas y el almacén, el índice, las
+    estadísticas y los agregados del anterior se amplían con ellas.
+    El scorer (por defecto, el simulado) se evalúa aquí una única vez.
+    """
+    import pandas as pd
+
+    start = time.perf_counter()
+    if os.path.exists(csv_file):
+        with open(csv_file, 'rb') as f:
+            raw = f.read()
+    else:
+        raw = b''
+    source_hash = hashlib.sha256(raw).hexdigest()
+
+    grown = _grown_rows(raw, previous)
+    if grown is not None:
+        rows, at_start = grown
+        df = pd.read_csv(io.BytesIO(rows), dtype={'Joker': str})
+        new_store = DrawStore.from_dataframe(df)
+        new_index = DrawIndex.from_dataframe(df)
+        store = previous.store.extend(new_store)
+        draws = new_index.concat(previous.draws) if at_start else previous.draws.concat(new_index)
+        statistics = previous.statistics.extended(new_store.dates, new_store.numbers)
+        aggregates = previous.aggregates.extend(store, len(previous.store))
+        n_draws = previous.n_draws + len(df)
+    else:
+        if raw:
+            df = pd.read_csv(io.BytesIO(raw), dtype={'Joker': str})
+        else:
+            df = pd.DataFrame(columns=NUMBER_COLUMNS)
+        store = DrawStore.from_dataframe(df)
+        draws = DrawIndex.from_dataframe(df)
+        statistics = DrawStatistics.from_dataframe(df)
+        aggregates = Aggregates.from_store(store)
+        n_draws = len(df)
+
+    counts = aggregates.number_counts
+    total = counts.sum()
+    # Frecuencia normalizada como 'stat_score' base
+    stat_vector = counts / total if total else np.zeros(len(NUMBERS))
+    scorer = scorer if scorer is not None else SimulatedScorer()
+    lstm_vector = np.asarray(scorer.score(store.numbers), dtype=float)
+
+    scores = np.round(fuse_scores(lstm_vector, stat_vector, weights), 4)
+    # Ranking completo precalculado (desempate por número ascendente)
+    ranking = np.argsort(-scores, kind='stable')
+
+    return EngineSnapshot(
+        source_hash=source_hash,
+        scorer=scorer.fingerprint,
+        n_draws=n_draws,
+        counts=_readonly(counts),
+        stat_vector=_readonly(stat_vector),
+        lstm_vector=_readonly(lstm_vector),
+        weights=weights,
+        scores=_readonly(scores),
+        ranking=_readonly(ranking),
+        draws=draws,
+        statistics=statistics,
+        store=store,
+        aggregates=aggregates,
+        build_seconds=time.perf_counter() - start,
+    )
@@ -0,0 +1,168 @@
+"""
+Módulo estadístico (Freq + Recency) sobre el histórico ordenado por fecha.
+
+Mantiene una matriz de sumas prefijas (49 × N+1) por número, de forma que la
+frecuencia en cualquier ventana de sorteos es una resta de dos columnas, y una
+frecuencia con decaimiento exponencial que se actualiza por sorteo.
+"""
+
+import re
+from typing import TYPE_CHECKING, Optional, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+from .constants import NUMBER_COLUMNS, NUMBERS
+
+# Vida media (en sorteos) por defecto de la frecuencia con decaimiento
+DEFAULT_HALF_LIFE = 104
+
+
+_DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+
+def parse_date(value: str) -> np.datetime64:
+    """Una fecha YYYY-MM-DD a datetime64[D] (NaT si no es válida), sin pandas."""
+    if _DATE_RE.match(value or ''):
+        try:
+            return np.datetime64(value, 'D')
+        except ValueError:
+            pass
+    return np.datetime64('NaT', 'D')
+
+
+def parse_dates(values) -> np.ndarray:
+    """Fechas YYYY-MM-DD a datetime64[D]; las inválidas quedan como NaT."""
+    import pandas as pd
+    return pd.to_datetime(pd.Series(values), format='%Y-%m-%d', errors='coerce').to_numpy('datetime64[D]')
+
+
+def draw_counts(draws: np.ndarray) -> np.ndarray:
+    """Matriz (n × 49) con 1 en los números de cada sorteo; ignora vacíos y fuera de rango."""
+    draws = np.asarray(draws, dtype=float)
+    onehot = np.zeros((len(draws), len(NUMBERS)), dtype=np.int32)
+    rows, cols = np.nonzero((draws >= 1) & (draws <= len(NUMBERS)))
+    np.add.at(onehot, (rows, draws[rows, cols].astype(np.int64) - 1), 1)
+    return onehot
+
+
+class DrawStatistics:
+    """Frecuencias por ventana y con decaimiento sobre el histórico cronológico."""
+
+    def __init__(self, dates: np.ndarray, draws: np.ndarray, half_life: float = DEFAULT_HALF_LIFE):
+        order = np.argsort(dates, kind='stable')
+        self.half_life = half_life
+        self.decay = 0.5 ** (1.0 / half_life)
+        self._size = 0
+        self._dates = np.empty(0, dtype='datetime64[D]')
+        self._prefix = np.zeros((len(NUMBERS), 1), dtype=np.int64)
+        self.decayed = np.zeros(len(NUMBERS))
+        self.extend(dates[order], draws[order])
+
+    @classmethod
+    def from_arrays(cls, dates: np.ndarray, prefix: np.ndarray, decayed: np.ndarray,
+                    half_life: float) -> 'DrawStatistics':
+        """Reconstruye el estado ya calculado (p. ej. desde un snapshot en disco)."""
+        stats = cls.__new__(cls)
+        stats.half_life = half_life
+        stats.decay = 0.5 ** (1.0 / half_life)
+        stats._size = len(dates)
+        stats._dates = dates
+        stats._prefix = prefix
+        # Se copia: `extend` lo actualiza en sitio
+        stats.decayed = np.array(decayed, dtype=float)
+        return stats
+
+    @classmethod
+    def from_dataframe(cls, df: 'pd.DataFrame', half_life: float = DEFAULT_HALF_LIFE) -> 'DrawStatistics':
+        import pandas as pd
+        if df.empty:
+            return cls(np.empty(0, dtype='datetime64[D]'),
+                       np.empty((0, len(NUMBER_COLUMNS))), half_life)
+        dates = parse_dates(df['fecha'])
+        valid = ~np.isnat(dates)
+        draws = df[NUMBER_COLUMNS].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+        return cls(dates[valid], draws[valid], half_life)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def dates(self) -> np.ndarray:
+        return self._dates[:self._size]
+
+    @property
+    def prefix(self) -> np.ndarray:
+        """Cuentas acumuladas (49 × N+1): columna t = apariciones en los t primeros sorteos."""
+        return self._prefix[:, :self._size + 1]
+
+    def extend(self, dates: np.ndarray, draws: np.ndarray) -> None:
+        """
+        Añade sorteos posteriores a los ya cargados (en orden cronológico).
+        Coste O(nuevos sorteos) amortizado: la matriz crece por duplicación.
+        """
+        if len(dates) == 0:
+            return
+        if self._size and dates[0] < self.dates[-1]:
+            raise ValueError("Los sorteos nuevos deben ser posteriores al último cargado")
+        onehot = draw_counts(draws)
+        needed = self._size + len(onehot) + 1
+        if needed > self._prefix.shape[1]:
+            capacity = max(needed, 2 * self._prefix.shape[1])
+            grown = np.zeros((len(NUMBERS), capacity), dtype=np.int64)
+            grown[:, :self._size + 1] = self.prefix
+            self._prefix = grown
+            dates_grown = np.empty(capacity - 1, dtype='datetime64[D]')
+            dates_grown[:self._size] = self.dates
+            self._dates = dates_grown
+
+        start = self._size + 1
+        np.cumsum(onehot.T, axis=1, out=self._prefix[:, start:start + len(onehot)])
+        self._prefix[:, start:start + len(onehot)] += self._prefix[:, start - 1:start]
+        self._dates[self._size:self._size + len(onehot)] = dates
+
+        # Decaimiento exponencial incremental: e_t = decay * e_{t-1} + x_t
+        for row in onehot:
+            self.decayed *= self.decay
+            self.decayed += row
+        self._size += len(onehot)
+
+    def extended(self, dates: np.ndarray, draws: np.ndarray) -> 'DrawStatistics':
+        """Copia con los sorteos añadidos; esta instancia (quizá publicada) no cambia."""
+        stats = DrawStatistics.from_arrays(self.dates, self.prefix, self.decayed, self.half_life)
+        stats.extend(dates, draws)
+        return stats
+
+    def window_counts(self, start: int, stop: int) -> np.ndarray:
+        """Apariciones por número en los sorteos [start, stop) (posiciones cronológicas)."""
+        start = min(max(start, 0), self._size)
+        stop = min(max(stop, start), self._size)
+        return self._prefix[:, stop] - self._prefix[:, start]
+
+    def window_bounds(self, last: Optional[int] = None,
+                      since: Optional[np.datetime64] = None,
+                      until: Optional[np.datetime64] = None) -> Tuple[int, int]:
+        """Posiciones [start, stop) de una ventana por número de sorteos y/o fechas."""
+        start, stop = 0, self._size
+        if since is not None:
+            start = int(np.searchsorted(self.dates, since, side='left'))
+        if until is not None:
+            stop = int(np.searchsorted(self.dates, until, side='right'))
+        if last is not None:
+            start = max(start, stop - last)
+        return start, max(start, stop)
+
+    def frequency(self, last: Optional[int] = None,
+                  since: Optional[np.datetime64] = None,
+                  until: Optional[np.datetime64] = None) -> np.ndarray:
+        """Frecuencia normalizada (suma 1) en la ventana pedida; ceros si está vacía."""
+        counts = self.window_counts(*self.window_bounds(last, since, until))
+        total = counts.sum()
+        return counts / total if total else np.zeros(len(NUMBERS))
+
+    def recency(self) -> np.ndarray:
+        """Frecuencia con decaimiento exponencial, normalizada."""
+        total = self.decayed.sum()
+        return self.decayed / total if total else np.zeros(len(NUMBERS))
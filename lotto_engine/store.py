@@ -0,0 +1,123 @@
+"""Almacén columnar en memoria de los sorteos históricos."""
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+from .constants import NUMBER_COLUMNS
+from .stats import parse_dates
+
+DOW_ES = ['Lun', 'Mar', 'Mie', 'Jue', 'Vie', 'Sab', 'Dom']
+# Valor centinela para números vacíos en las columnas uint8
+MISSING = np.uint8(255)
+
+
+def _uint8_column(values: 'pd.Series') -> np.ndarray:
+    import pandas as pd
+    numeric = pd.to_numeric(values, errors='coerce')
+    numeric = numeric.where((numeric >= 0) & (numeric < MISSING))
+    return numeric.fillna(MISSING).to_numpy(dtype=np.uint8)
+
+
+def _nullable(values: np.ndarray) -> List[Optional[int]]:
+    return [None if v == MISSING else v for v in values.tolist()]
+
+
+@dataclass(frozen=True)
+class DrawStore:
+    """
+    Columnas de sorteos ordenadas por fecha ascendente. Las consultas por
+    fecha usan búsqueda binaria y los cortes por límite son vistas sin copia.
+    """
+    dates: np.ndarray      # datetime64[D]
+    dow: np.ndarray        # uint8, índice en DOW_ES (255 si desconocido)
+    numbers: np.ndarray    # uint8 (n × 6)
+    comp: np.ndarray       # uint8
+    reintegro: np.ndarray  # uint8
+    joker: np.ndarray      # str (unicode de ancho fijo)
+
+    @classmethod
+    def from_dataframe(cls, df: 'pd.DataFrame') -> 'DrawStore':
+        if df.empty:
+            return cls(
+                dates=np.empty(0, dtype='datetime64[D]'),
+                dow=np.empty(0, dtype=np.uint8),
+                numbers=np.empty((0, len(NUMBER_COLUMNS)), dtype=np.uint8),
+                comp=np.empty(0, dtype=np.uint8),
+                reintegro=np.empty(0, dtype=np.uint8),
+                joker=np.empty(0, dtype='U1'),
+            )
+        dates = parse_dates(df['fecha'])
+        valid = ~np.isnat(dates)
+        df = df[valid]
+        order = np.argsort(dates[valid], kind='stable')
+        df = df.iloc[order]
+
+        dow_codes = {name: i for i, name in enumerate(DOW_ES)}
+        arrays = dict(
+            dates=dates[valid][order],
+            dow=df['dow_es'].map(dow_codes).fillna(MISSING).to_numpy(dtype=np.uint8),
+            numbers=np.column_stack([_uint8_column(df[col]) for col in NUMBER_COLUMNS]),
+            comp=_uint8_column(df['C']),
+            reintegro=_uint8_column(df['R']),
+            joker=df['Joker'].fillna('').astype(str).str.strip().to_numpy(dtype=str),
+        )
+        for arr in arrays.values():
+            arr.flags.writeable = False
+        return cls(**arrays)
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def extend(self, newer: 'DrawStore') -> 'DrawStore':
+        """Almacén nuevo con los sorteos de `newer` (todos posteriores) al final."""
+        if not len(newer):
+            return self
+        arrays = {
+            name: np.concatenate([getattr(self, name), getattr(newer, name)])
+            for name in ('dates', 'dow', 'numbers', 'comp', 'reintegro', 'joker')
+        }
+        for arr in arrays.values():
+            arr.flags.writeable = False
+        return DrawStore(**arrays)
+
+    def latest(self, limit: int) -> slice:
+        """Los `limit` sorteos más recientes, del más nuevo al más antiguo."""
+        start = max(len(self) - limit, 0)
+        return slice(len(self) - 1, start - 1 if start else None, -1)
+
+    def since(self, date: np.datetime64) -> slice:
+        """Sorteos con fecha >= `date`, del más nuevo al más antiguo."""
+        start = int(np.searchsorted(self.dates, date, side='left'))
+        return slice(len(self) - 1, start - 1 if start else None, -1)
+
+    def recent_days(self, days: int) -> slice:
+        """Sorteos de los últimos `days` días desde la fecha más reciente."""
+        if not len(self):
+            return slice(0, 0)
+        return self.since(self.dates[-1] - np.timedelta64(days, 'D'))
+
+    def find(self, date: np.datetime64) -> Optional[int]:
+        """Posición del sorteo de una fecha, o None."""
+        pos = int(np.searchsorted(self.dates, date, side='left'))
+        if pos < len(self) and self.dates[pos] == date:
+            return pos
+        return None
+
+    def records(self, rows: slice) -> List[Dict[str, Any]]:
+        """Serializa un corte (vistas de las columnas) a registros SorteoResponse."""
+        numbers = self.numbers[rows]
+        columns = [
+            self.dates[rows].astype(str).tolist(),
+            [DOW_ES[d] if d < len(DOW_ES) else '' for d in self.dow[rows].tolist()],
+            *(_nullable(numbers[:, i]) for i in range(numbers.shape[1])),
+            _nullable(self.comp[rows]),
+            _nullable(self.reintegro[rows]),
+            self.joker[rows].tolist(),
+        ]
+        keys = ['fecha', 'dow_es', *NUMBER_COLUMNS, 'C', 'R', 'Joker']
+        return [dict(zip(keys, values)) for values in zip(*columns)]
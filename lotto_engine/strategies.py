@@ -0,0 +1,40 @@
+"""Estrategias de generación de combinaciones a partir de los números top-N."""
+
+from typing import Iterator, Optional
+
+import numpy as np
+
+from .coverage import iter_cover_combinations
+from .sampling import COMBINATION_SIZE, DEFAULT_CHUNK_SIZE, iter_combinations
+
+# weighted: ponderada por score; random: uniforme; coverage: máxima cobertura de parejas y tríos
+STRATEGIES = ("weighted", "random", "coverage")
+DEFAULT_STRATEGY = "weighted"
+
+
+def strategy_weights(strategy: str, weights: np.ndarray) -> np.ndarray:
+    """Pesos de muestreo que usa cada estrategia."""
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Estrategia desconocida: {strategy} (opciones: {', '.join(STRATEGIES)})")
+    weights = np.asarray(weights, dtype=float)
+    return np.ones_like(weights) if strategy == "random" else weights
+
+
+def iter_strategy_combinations(strategy: str, numbers: np.ndarray, weights: np.ndarray,
+                               n_combinations: int, rng: Optional[np.random.Generator] = None,
+                               size: int = COMBINATION_SIZE,
+                               chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[np.ndarray]:
+    """Bloques de combinaciones distintas según `strategy`."""
+    weights = strategy_weights(strategy, weights)
+    generate = iter_cover_combinations if strategy == "coverage" else iter_combinations
+    return generate(numbers, weights, n_combinations, rng, size, chunk_size)
+
+
+def strategy_combinations(strategy: str, numbers: np.ndarray, weights: np.ndarray,
+                          n_combinations: int, rng: Optional[np.random.Generator] = None,
+                          size: int = COMBINATION_SIZE) -> np.ndarray:
+    """Como iter_strategy_combinations, todas en una matriz."""
+    chunks = list(iter_strategy_combinations(strategy, numbers, weights, n_combinations, rng, size))
+    if not chunks:
+        return np.empty((0, size), dtype=np.asarray(numbers).dtype)
+    return np.concatenate(chunks)
@@ -2,47 +2,131 @@
 """CLI para el transformador de datos de lotería."""
 
 import argparse
+import glob
 import sys
 from pathlib import Path
-from .transformer import LottoTransformer
+from .transformer import DEFAULT_CHUNK_SIZE, LottoTransformer, expand_inputs
 
 
 def main():
     """Función principal del CLI."""
     parser = argparse.ArgumentParser(
-        description="Transforma datos históricos de lotería de raw a clean"
+        description="Transforma datos históricos de lotería de raw a clean",
+        epilog="Un archivo: lotto-transform raw.csv clean.csv | "
+               "Varios: lotto-transform 'raw/*.csv' --output-dir clean/ [--merge todo.csv]"
     )
-    
+
+    parser.add_argument(
+        "files",
+        nargs="+",
+        metavar="INPUT",
+        help="Entrada y salida (INPUT OUTPUT o INPUT -o OUTPUT), o varias entradas/patrones glob con --output-dir o --merge"
+    )
+
+    parser.add_argument(
+        "-o", "--output",
+        help="Archivo de salida de una única entrada"
+    )
+
+    parser.add_argument(
+        "--output-dir",
+        help="Directorio de salida de cada archivo (<nombre>_clean.csv)"
+    )
+
     parser.add_argument(
-        "input_file",
-        help="Archivo CSV de entrada (formato raw)"
+        "--merge",
+        metavar="OUTPUT",
+        help="Fusionar todas las salidas en un CSV ordenado por fecha y sin duplicados"
     )
-    
+
+    parser.add_argument(
+        "-j", "--workers",
+        type=int,
+        help="Procesos en paralelo con varias entradas (por defecto, uno por núcleo)"
+    )
+
     parser.add_argument(
-        "output_file", 
-        help="Archivo CSV de salida (formato clean)"
+        "--stream",
+        action="store_true",
+        help="Procesar por bloques (memoria acotada por el tamaño de bloque)"
     )
-    
+
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f"Filas por bloque en modo --stream (por defecto {DEFAULT_CHUNK_SIZE})"
+    )
+
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Añadir al archivo de salida solo los sorteos posteriores al más reciente que ya tiene"
+    )
+
     args = parser.parse_args()
-    
+
+    if args.output and (args.output_dir or args.merge):
+        parser.error("-o/--output no se combina con --output-dir ni --merge")
+    if args.output_dir or args.merge:
+        transform_many(parser, args)
+        return
+    if args.output:
+        files = expand_inputs(args.files)
+        if len(files) != 1:
+            parser.error(f"-o/--output admite una sola entrada y hay {len(files)}: usa --output-dir o --merge")
+        input_file, output_file = files[0], args.output
+    elif len(args.files) == 2 and not any(glob.has_magic(f) for f in args.files):
+        # Forma clásica INPUT OUTPUT, solo con rutas literales
+        input_file, output_file = args.files
+    else:
+        parser.error("indica INPUT OUTPUT, INPUT -o OUTPUT, o usa --output-dir/--merge con varias entradas")
+
     # Verificar que el archivo de entrada existe
-    input_path = Path(args.input_file)
+    input_path = Path(input_file)
     if not input_path.exists():
-        print(f"❌ Error: El archivo {args.input_file} no existe")
+        print(f"❌ Error: El archivo {input_file} no existe")
         sys.exit(1)
-    
+
     # Crear directorio de salida si no existe
-    output_path = Path(args.output_file)
+    output_path = Path(output_file)
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    
+
     # Ejecutar transformación
     try:
         transformer = LottoTransformer()
-        transformer.transform(args.input_file, args.output_file)
+        if args.incremental:
+            transformer.transform_incremental(input_file, output_file)
+        elif args.stream:
+            transformer.transform_stream(input_file, output_file, args.chunk_size)
+        else:
+            transformer.transform(input_file, output_file)
+    except Exception as e:
+        print(f"❌ Error durante la transformación: {e}")
+        sys.exit(1)
+
+
+def transform_many(parser, args):
+    """Varias entradas en paralelo, con salida por archivo y/o fusionada."""
+    if args.stream or args.incremental:
+        parser.error("--stream e --incremental solo admiten una entrada y una salida")
+
+    files = expand_inputs(args.files)
+    missing = [f for f in files if not Path(f).exists()]
+    if not files or missing:
+        print(f"❌ Error: No existen archivos de entrada: {', '.join(missing or args.files)}")
+        sys.exit(1)
+
+    if args.merge:
+        Path(args.merge).parent.mkdir(parents=True, exist_ok=True)
+
+    try:
+        counts = LottoTransformer().transform_many(files, args.output_dir, args.merge, args.workers)
     except Exception as e:
         print(f"❌ Error durante la transformación: {e}")
         sys.exit(1)
+    print(f"📊 {len(counts)} archivos, {sum(counts.values())} registros transformados")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,6 +1,26 @@
+import glob
+import heapq
+import os
+import re
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 import pandas as pd
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Iterable, List, Optional, Sequence
+
+# Día de la semana por índice (dayofweek: 0 = lunes)
+DOW_BY_INDEX = np.array(['Lun', 'Mar', 'Mie', 'Jue', 'Vie', 'Sab', 'Dom'], dtype=object)
+NUMERIC_COLUMNS = ['N1', 'N2', 'N3', 'N4', 'N5', 'N6', 'C', 'R']
+# Lo que int() acepta tras strip(): signo opcional, dígitos y '_' entre dígitos
+INTEGER_PATTERN = r'[+-]?\d+(?:_\d+)*'
+# Filas por bloque en modo streaming
+DEFAULT_CHUNK_SIZE = 100_000
+# Filas por bloque en modo incremental (pocos sorteos nuevos por ejecución)
+INCREMENTAL_CHUNK_SIZE = 64
+ISO_DATE_PATTERN = r'\d{4}-\d{2}-\d{2}'
 
 class LottoTransformer:
     """Transformador de datos históricos de lotería."""
@@ -36,51 +56,386 @@ class LottoTransformer:
         except (ValueError, TypeError):
             return None
     
-    def transform(self, input_file: str, output_file: str) -> None:
-        """Transforma archivo raw a formato clean."""
+    def transform(self, input_file: str, output_file: str, sort_by_date: bool = False) -> int:
+        """
+        Transforma archivo raw a formato clean; devuelve los registros escritos.
+        Con `sort_by_date`, de la fecha más reciente a la más antigua.
+        """
         # Leer CSV con formato actual
         df = pd.read_csv(input_file, encoding='utf-8')
         
-        clean_data = []
-        
-        for _, row in df.iterrows():
-            # Parsear fecha
-            fecha_clean, dow = self.parse_date(row['FECHA'])
-            
-            # Extraer números de combinación (columnas 1-6)
-            numeros = []
-            for i in range(1, 7):
-                col_name = df.columns[i]  # Columnas de números
-                numeros.append(self.clean_numeric_value(row[col_name]))
-            
-            # Complementario y Reintegro
-            comp = self.clean_numeric_value(row['COMP.'])
-            reintegro = self.clean_numeric_value(row['R.'])
-            
-            # Joker
-            joker = str(row.get('JOKER', '')).strip()
-            if joker == 'nan' or pd.isna(joker):
-                joker = ''
-            
-            clean_row = {
-                'fecha': fecha_clean,
-                'dow_es': dow,
-                'N1': numeros[0],
-                'N2': numeros[1], 
-                'N3': numeros[2],
-                'N4': numeros[3],
-                'N5': numeros[4],
-                'N6': numeros[5],
-                'C': comp,
-                'R': reintegro,
-                'Joker': joker
-            }
-            
-            clean_data.append(clean_row)
+        clean_df = self.transform_frame(df)
+        if sort_by_date and not clean_df.empty:
+            keys = [_date_key(fecha) for fecha in clean_df['fecha']]
+            clean_df = clean_df.iloc[sorted(range(len(keys)), key=keys.__getitem__, reverse=True)]
         
         # Guardar CSV limpio
-        clean_df = pd.DataFrame(clean_data)
         clean_df.to_csv(output_file, index=False, encoding='utf-8')
         
-        print(f"✅ Transformación completada: {len(clean_data)} registros")
-        print(f"📁 Guardado en: {output_file}")
\ No newline at end of file
+        print(f"✅ Transformación completada: {len(clean_df)} registros")
+        print(f"📁 Guardado en: {output_file}")
+        return len(clean_df)
+
+    def transform_many(self, inputs: Iterable[str], output_dir: Optional[str] = None,
+                       merge_file: Optional[str] = None,
+                       workers: Optional[int] = None) -> Dict[str, int]:
+        """
+        Transforma varios archivos raw (rutas o patrones glob) en paralelo,
+        un proceso por núcleo salvo que se indique `workers`.
+
+        Cada archivo se escribe en `output_dir` como `<nombre>_clean.csv`
+        (`historico_raw.csv` → `historico_clean.csv`). Con `merge_file`, las
+        salidas se ordenan por fecha y se fusionan en un único CSV sin filas
+        repetidas. Devuelve los registros de cada archivo de entrada.
+        """
+        files = expand_inputs(inputs)
+        if not files:
+            raise FileNotFoundError("Ningún archivo de entrada coincide")
+        if output_dir is None and merge_file is None:
+            raise ValueError("Indica output_dir, merge_file o ambos")
+
+        with tempfile.TemporaryDirectory(prefix='lotto_clean_') as scratch:
+            outputs = clean_file_names(files, output_dir or scratch)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+            jobs = [(f, outputs[f], merge_file is not None) for f in files]
+            workers = min(workers or os.cpu_count() or 1, len(jobs))
+            if workers > 1:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    counts = list(pool.map(_transform_file, jobs))
+            else:
+                counts = [_transform_file(job) for job in jobs]
+
+            if merge_file is not None:
+                total = merge_clean_files([outputs[f] for f in files], merge_file)
+                print(f"✅ Fusión completada: {total} registros de {len(files)} archivos")
+                print(f"📁 Guardado en: {merge_file}")
+        return dict(zip(files, counts))
+
+    def transform_stream(self, input_file: str, output_file: str,
+                         chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+        """
+        Transforma por bloques de `chunk_size` filas, añadiendo cada bloque al
+        CSV de salida: la memoria depende del bloque, no del archivo.
+
+        Las celdas se leen como texto para que el resultado no dependa de cómo
+        caen los bloques; con datos bien formados coincide con `transform`.
+        La salida se escribe en un temporal y se renombra al terminar.
+        """
+        reader = pd.read_csv(input_file, encoding='utf-8', dtype=str, chunksize=chunk_size)
+        tmp_file = f"{output_file}.tmp"
+        total = 0
+        header = True
+        try:
+            with open(tmp_file, 'w', encoding='utf-8', newline='') as out:
+                for chunk in reader:
+                    clean_df = self.transform_frame(chunk, nullable=True)
+                    if clean_df.empty:
+                        continue
+                    clean_df.to_csv(out, index=False, header=header)
+                    header = False
+                    total += len(clean_df)
+                if header:
+                    pd.DataFrame().to_csv(out, index=False)
+            os.replace(tmp_file, output_file)
+        finally:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+
+        print(f"✅ Transformación completada: {total} registros (bloques de {chunk_size})")
+        print(f"📁 Guardado en: {output_file}")
+        return total
+
+    def transform_incremental(self, input_file: str, output_file: str,
+                              chunk_size: int = INCREMENTAL_CHUNK_SIZE) -> int:
+        """
+        Añade a `output_file` solo los sorteos posteriores al más reciente que
+        ya contiene. El raw está ordenado del más nuevo al más antiguo, así que
+        se lee por bloques y se deja de leer al llegar a esa fecha.
+
+        Sin archivo clean previo (o con otro formato) hace la transformación
+        completa. Devuelve el número de registros nuevos.
+        """
+        watermark, header = self.read_watermark(output_file)
+        if watermark is None:
+            print("ℹ️  Sin histórico clean previo: transformación completa")
+            return self.transform(input_file, output_file)
+
+        new_rows = []
+        reader = pd.read_csv(input_file, encoding='utf-8', dtype=str, chunksize=chunk_size)
+        for chunk in reader:
+            clean_df = self.transform_frame(chunk, nullable=True)
+            if clean_df.empty:
+                continue
+            fecha = clean_df['fecha']
+            seen = (fecha.str.fullmatch(ISO_DATE_PATTERN) & (fecha <= watermark)).to_numpy()
+            if seen.any():
+                new_rows.append(clean_df.iloc[:int(np.argmax(seen))])
+                break
+            new_rows.append(clean_df)
+        reader.close()
+
+        new_df = pd.concat(new_rows, ignore_index=True) if new_rows else pd.DataFrame()
+        if new_df.empty:
+            print(f"✅ Sin sorteos nuevos (último: {watermark})")
+            return 0
+        if ','.join(new_df.columns) != header:
+            print("ℹ️  Formato del histórico clean distinto: transformación completa")
+            return self.transform(input_file, output_file)
+
+        # Nuevos arriba (orden del raw) y el histórico tal cual, copiado en bytes
+        tmp_file = f"{output_file}.tmp"
+        try:
+            with open(tmp_file, 'w', encoding='utf-8', newline='') as out, \
+                    open(output_file, 'r', encoding='utf-8', newline='') as old:
+                new_df.to_csv(out, index=False)
+                old.readline()
+                shutil.copyfileobj(old, out)
+            os.replace(tmp_file, output_file)
+        finally:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+
+        print(f"✅ Transformación incremental: {len(new_df)} registros nuevos (posteriores a {watermark})")
+        print(f"📁 Guardado en: {output_file}")
+        return len(new_df)
+
+    @staticmethod
+    def read_watermark(clean_file: str) -> tuple:
+        """
+        Fecha más reciente de un CSV clean (su primera fila, que es la más
+        nueva) y su cabecera. (None, None) si no existe o no es válido.
+        """
+        if not os.path.exists(clean_file):
+            return None, None
+        try:
+            head = pd.read_csv(clean_file, dtype=str, nrows=1)
+        except (pd.errors.EmptyDataError, pd.errors.ParserError, UnicodeDecodeError):
+            return None, None
+        if head.empty or 'fecha' not in head.columns:
+            return None, None
+        fecha = head['fecha'].iloc[0]
+        if not isinstance(fecha, str) or not pd.Series([fecha]).str.fullmatch(ISO_DATE_PATTERN).iloc[0]:
+            return None, None
+        return fecha, ','.join(head.columns)
+
+    def transform_frame(self, df: pd.DataFrame, nullable: bool = False) -> pd.DataFrame:
+        """
+        Transformación por columnas de un DataFrame raw. Mismo resultado que
+        aplicar parse_date y clean_numeric_value fila a fila.
+
+        Con `nullable`, las columnas numéricas quedan como enteros nullable
+        (mismo formato en cualquier bloque) en vez de imitar la inferencia de
+        tipos de un DataFrame construido desde dicts.
+        """
+        if df.empty:
+            return pd.DataFrame()
+
+        fecha, dow = self.parse_dates(df['FECHA'])
+        clean = {'fecha': fecha, 'dow_es': dow}
+        # Números de combinación: columnas 1-6 por posición
+        for i in range(1, 7):
+            clean[f'N{i}'] = self.clean_numeric_column(df.iloc[:, i])
+        clean['C'] = self.clean_numeric_column(df['COMP.'])
+        clean['R'] = self.clean_numeric_column(df['R.'])
+        clean['Joker'] = self.clean_joker_column(df['JOKER']) if 'JOKER' in df.columns else ''
+
+        clean_df = pd.DataFrame(clean, index=df.index).reset_index(drop=True)
+        if nullable:
+            # El Joker leído como texto conserva ceros a la izquierda; como
+            # columna entera (lectura completa) se pierden
+            joker = clean_df['Joker']
+            digits = joker.str.fullmatch(r'\d+') if 'JOKER' in df.columns else None
+            if digits is not None and digits.any():
+                clean_df.loc[digits, 'Joker'] = joker[digits].map(lambda v: str(int(v)))
+            return clean_df
+        # Como un DataFrame construido desde dicts: enteros sin huecos como int64,
+        # con huecos como float64 y sin ningún valor como columna vacía
+        for column in NUMERIC_COLUMNS:
+            values = clean_df[column]
+            if not values.hasnans:
+                clean_df[column] = values.astype('int64')
+            elif values.notna().any():
+                clean_df[column] = values.astype('float64')
+            else:
+                clean_df[column] = pd.Series([None] * len(values), dtype=object)
+        return clean_df
+
+    def parse_dates(self, values: pd.Series) -> tuple:
+        """
+        parse_date por columnas. Las fechas DD/MM/YYYY exactas se leen de
+        golpe desde los códigos de carácter; el día de la semana sale de una
+        tabla por dayofweek. El resto pasa por un parseo masivo con formato
+        '%d/%m/%Y' y, si tampoco vale, por parse_date.
+        """
+        text = values.astype(str).to_numpy()
+        fecha = text.copy()
+        dow = np.full(len(text), 'Jue', dtype=object)
+
+        days, exact = _parse_exact_dates(text.astype('U'))
+        fecha[exact] = days[exact].astype(str)
+        dow[exact] = DOW_BY_INDEX[_dayofweek(days[exact])]
+
+        rest = np.flatnonzero(~exact)
+        if len(rest):
+            stripped = pd.Series(text[rest]).str.strip()
+            dates = pd.to_datetime(stripped, format='%d/%m/%Y', errors='coerce')
+            valid = dates.notna().to_numpy()
+            parsed = dates[valid].to_numpy().astype('datetime64[D]')
+            fecha[rest[valid]] = parsed.astype(str)
+            dow[rest[valid]] = DOW_BY_INDEX[_dayofweek(parsed)]
+            # Fechas fuera del rango de pandas o no válidas: fila a fila
+            for i in rest[~valid]:
+                fecha[i], dow[i] = self.parse_date(text[i])
+        return fecha, dow
+
+    @staticmethod
+    def clean_numeric_column(values: pd.Series) -> pd.Series:
+        """
+        clean_numeric_value por columnas: enteros como texto o columna entera;
+        el resto (incluidos los floats, como int(str(5.0))) queda vacío.
+        Devuelve el entero nullable más pequeño que cabe.
+        """
+        if pd.api.types.is_integer_dtype(values.dtype) and not pd.api.types.is_bool_dtype(values.dtype):
+            numbers = values.astype('Int64')
+        else:
+            text = values.astype(str).str.strip()
+            match = text.str.fullmatch(INTEGER_PATTERN) & values.notna()
+            numbers = pd.Series(pd.NA, index=values.index, dtype='Int64')
+            if match.any():
+                numbers[match] = text[match].map(int)
+        return numbers.astype(_smallest_int_dtype(numbers))
+
+    @staticmethod
+    def clean_joker_column(values: pd.Series) -> pd.Series:
+        """Joker como texto; 'nan' (celda vacía) pasa a cadena vacía."""
+        text = values.astype(str)
+        if values.dtype == object:
+            text = text.str.strip()
+        return text.where(text != 'nan', '')
+
+
+def expand_inputs(inputs: Iterable[str]) -> List[str]:
+    """Rutas de entrada con los patrones glob expandidos, sin repetir."""
+    files = []
+    for item in inputs:
+        matches = sorted(glob.glob(item)) if glob.has_magic(item) else [item]
+        files.extend(m for m in matches if m not in files)
+    return files
+
+
+def clean_file_names(files: Sequence[str], output_dir: str) -> Dict[str, str]:
+    """Salida de cada archivo raw en `output_dir`; error si dos coinciden."""
+    outputs = {}
+    for f in files:
+        stem = os.path.splitext(os.path.basename(f))[0]
+        stem = stem[:-len('_raw')] if stem.endswith('_raw') else stem
+        outputs[f] = os.path.join(output_dir, f"{stem}_clean.csv")
+    if len(set(outputs.values())) < len(outputs):
+        raise ValueError("Varios archivos de entrada darían el mismo archivo de salida")
+    return outputs
+
+
+def merge_clean_files(clean_files: Sequence[str], output_file: str) -> int:
+    """
+    Fusión k-way de CSV clean ordenados por fecha descendente: lee una línea
+    de cada archivo a la vez, sin cargarlos enteros. Las filas idénticas del
+    mismo día (exportaciones solapadas) se escriben una sola vez. Devuelve
+    las filas escritas.
+    """
+    handles = [open(f, 'r', encoding='utf-8', newline='') for f in clean_files]
+    tmp_file = f"{output_file}.tmp"
+    total = 0
+    try:
+        header = None
+        sources = []
+        for handle in handles:
+            line = handle.readline()
+            if not line.strip():
+                continue  # Archivo sin registros
+            if header is not None and line != header:
+                raise ValueError(f"Cabecera distinta en {handle.name}")
+            header = line
+            sources.append(handle)
+
+        with open(tmp_file, 'w', encoding='utf-8', newline='') as out:
+            out.write(header or '\n')
+            day, written = None, set()
+            for line in heapq.merge(*sources, key=_line_date_key, reverse=True):
+                if not line.endswith('\n'):
+                    line += '\n'
+                fecha = line.split(',', 1)[0]
+                if fecha != day:
+                    day, written = fecha, set()
+                if line in written:
+                    continue
+                written.add(line)
+                out.write(line)
+                total += 1
+        os.replace(tmp_file, output_file)
+    finally:
+        for handle in handles:
+            handle.close()
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+    return total
+
+
+def _transform_file(job: tuple) -> int:
+    """Trabajo de un proceso del pool: (entrada, salida, ordenar por fecha)."""
+    input_file, output_file, sort_by_date = job
+    return LottoTransformer().transform(input_file, output_file, sort_by_date)
+
+
+def _date_key(fecha: str) -> str:
+    """Clave de orden: la fecha ISO, o '' (al final) si no lo es."""
+    return fecha if re.fullmatch(ISO_DATE_PATTERN, fecha) else ''
+
+
+def _line_date_key(line: str) -> str:
+    return _date_key(line.split(',', 1)[0])
+
+
+def _smallest_int_dtype(numbers: pd.Series) -> str:
+    if numbers.notna().any():
+        low, high = int(numbers.min()), int(numbers.max())
+        for dtype in ('Int8', 'Int16', 'Int32'):
+            info = np.iinfo(dtype.lower())
+            if info.min <= low and high <= info.max:
+                return dtype
+    return 'Int64'
+
+
+def _parse_exact_dates(text: np.ndarray) -> tuple:
+    """
+    Fechas 'DD/MM/YYYY' (exactamente 10 caracteres, año >= 1000) a
+    datetime64[D] operando sobre los códigos UCS-4 del array. Devuelve las
+    fechas y la máscara de las válidas.
+    """
+    n = len(text)
+    width = text.dtype.itemsize // 4
+    if width < 10 or n == 0:
+        return np.zeros(n, dtype='datetime64[D]'), np.zeros(n, dtype=bool)
+    codes = text.view(np.uint32).reshape(n, width)
+    exact = codes[:, 9] != 0
+    if width > 10:
+        exact &= codes[:, 10] == 0
+    exact &= (codes[:, 2] == ord('/')) & (codes[:, 5] == ord('/'))
+    digits = codes[:, [0, 1, 3, 4, 6, 7, 8, 9]].astype(np.int64) - ord('0')
+    exact &= ((digits >= 0) & (digits <= 9)).all(axis=1)
+
+    day = digits[:, 0] * 10 + digits[:, 1]
+    month = digits[:, 2] * 10 + digits[:, 3]
+    year = digits[:, 4] * 1000 + digits[:, 5] * 100 + digits[:, 6] * 10 + digits[:, 7]
+    exact &= (day >= 1) & (day <= 31) & (month >= 1) & (month <= 12) & (year >= 1000)
+
+    months = np.where(exact, (year - 1970) * 12 + month - 1, 0).astype('datetime64[M]')
+    days = months.astype('datetime64[D]') + np.where(exact, day - 1, 0)
+    # 31/02 y similares caen en el mes siguiente: no válidas
+    exact &= days.astype('datetime64[M]') == months
+    return days, exact
+
+
+def _dayofweek(days: np.ndarray) -> np.ndarray:
+    """Día de la semana (0 = lunes) de fechas datetime64[D]; 1970-01-01 fue jueves."""
+    return (days.astype(np.int64) + 3) % 7
@@ -1,14 +1,30 @@
 import os
-import random
+import time
 import logging
-import pandas as pd
-from typing import List, Dict, Any, Optional
+import numpy as np
+from typing import List, Dict, Any, Iterator, Literal, Optional
 from datetime import datetime
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException, Query, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
+from lotto_engine import EngineSnapshot, Scorer, build_snapshot, fuse_scores, load_scorer
+from lotto_engine.aggregates import JSONPayload
+from lotto_engine.cache import ResponseCache
+from lotto_engine.encoding import dumps
+from lotto_engine.jobs import RetrainJobManager, build_engine_snapshot
+from lotto_engine.metrics import CONTENT_TYPE, ENGINE_STAGE_SECONDS, REGISTRY
+from lotto_engine.persistence import DEFAULT_SNAPSHOT_FILE, load_snapshot
+from lotto_engine.sampling import sample_combination_sets
+from lotto_engine.shared import SharedJobRegistry, SharedSnapshotStore, default_shared_dir
+from lotto_engine.snapshot import NUMBERS, source_file_hash, top_indices
+from lotto_engine.stats import parse_date
+from lotto_engine.strategies import (
+    DEFAULT_STRATEGY, iter_strategy_combinations, strategy_combinations, strategy_weights
+)
+
 # Configuración de logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("lotto_api")
@@ -16,7 +32,37 @@ logger = logging.getLogger("lotto_api")
 # Constantes
 CSV_FILE = "data/historico_clean.csv"
 MODEL_DIR = "models"
-STAT_FILE = "data/statistical_data.pkl"
+STAT_FILE = DEFAULT_SNAPSHOT_FILE
+# Combinaciones por bloque en /predict/stream
+STREAM_CHUNK_SIZE = 4096
+# Serializar /predict directamente desde los arrays, sin modelos pydantic
+FAST_JSON = os.getenv("LOTTO_FAST_JSON", "0") == "1"
+# Combinaciones máximas en las respuestas no streaming (más: /predict/stream)
+MAX_COMBINATIONS = 10000
+# Peticiones máximas por llamada a /user/predict/batch y combinaciones en total
+MAX_BATCH_SIZE = 1000
+MAX_BATCH_COMBINATIONS = 100000
+# Generación de combinaciones: ponderada por score, uniforme o de máxima cobertura
+Strategy = Literal["weighted", "random", "coverage"]
+
+# --- Métricas (registro local, expuesto en /metrics) ---
+
+HTTP_REQUESTS = REGISTRY.counter(
+    "lotto_http_requests_total", "Peticiones HTTP por ruta y código", ["method", "route", "status"]
+)
+HTTP_LATENCY = REGISTRY.histogram(
+    "lotto_http_request_seconds", "Latencia HTTP por ruta (hasta el último byte)", ["method", "route"]
+)
+LOAD_STATISTICS_SECONDS = REGISTRY.gauge(
+    "lotto_load_statistics_seconds", "Segundos que tardó en construirse el snapshot publicado"
+)
+SNAPSHOT_BUILD_SECONDS = REGISTRY.histogram(
+    "lotto_snapshot_build_seconds", "Duración de cada construcción de snapshot (arranque o reentreno)",
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0),
+)
+SNAPSHOT_AGE_SECONDS = REGISTRY.gauge(
+    "lotto_snapshot_age_seconds", "Segundos desde que se construyó el snapshot publicado"
+)
 
 # --- Pydantic Models (según openapi.json) ---
 
@@ -33,107 +79,377 @@ class PredictionResponse(BaseModel):
 
 class UserPredictionRequest(BaseModel):
     top_n: int = Field(15, title="Top N")
-    n_combinations: int = Field(10, title="N Combinations")
+    n_combinations: int = Field(10, le=MAX_COMBINATIONS, title="N Combinations",
+                                description="Más combinaciones: /predict/stream")
+    window: Optional[int] = Field(None, ge=1, title="Window", description="Últimos N sorteos para el stat score")
+    seed: Optional[int] = Field(None, ge=0, title="Seed", description="Semilla para combinaciones reproducibles")
+    strategy: Strategy = Field(DEFAULT_STRATEGY, title="Strategy", description="weighted | random | coverage")
+
+class SorteoResponse(BaseModel):
+    fecha: str = Field(..., title="Fecha", description="Fecha del sorteo (YYYY-MM-DD)")
+    dow_es: str = Field(..., title="Dow Es", description="Día de la semana (Lun|Mar|Mie|Jue|Vie|Sab|Dom)")
+    N1: Optional[int] = Field(None, title="N1")
+    N2: Optional[int] = Field(None, title="N2")
+    N3: Optional[int] = Field(None, title="N3")
+    N4: Optional[int] = Field(None, title="N4")
+    N5: Optional[int] = Field(None, title="N5")
+    N6: Optional[int] = Field(None, title="N6")
+    C: Optional[int] = Field(None, title="C", description="Complementario")
+    R: Optional[int] = Field(None, title="R", description="Reintegro")
+    Joker: str = Field("", title="Joker")
+
+class HistoryCheckRequest(BaseModel):
+    combinations: List[List[int]] = Field(..., title="Combinations", description="Combinaciones de 6 números (1-49)")
+
+class CombinationMatches(BaseModel):
+    combination: List[int] = Field(..., title="Combination")
+    matches: Dict[str, int] = Field(..., title="Matches", description="Sorteos por categoría de acierto (6, 5+C, 5, 4, 3)")
+
+class HistoryCheckResponse(BaseModel):
+    results: List[CombinationMatches] = Field(..., title="Results")
+    metadata: Dict[str, Any] = Field(..., title="Metadata")
 
 # --- Lógica de Negocio / Mock Engine ---
 
 class PredictionEngine:
-    def __init__(self):
-        self.stats = {}
+    def __init__(self, shared_dir: Optional[str] = None, fast_json: bool = False):
+        # Snapshot publicado; los lectores toman la referencia una vez por petición
+        self.snapshot: Optional[EngineSnapshot] = None
+        self.scorer: Optional[Scorer] = None
         self.is_loaded = False
+        # Segmentos en memoria compartida entre workers (desactivado con "")
+        self.shared = SharedSnapshotStore(shared_dir) if shared_dir else None
+        # Respuestas de predicción serializadas, por parámetros y versión de snapshot
+        self.response_cache = ResponseCache()
+        self.fast_json = fast_json
 
     def load_models(self):
         """
         Carga los modelos LSTM y los datos estadísticos.
-        En esta implementación base, calculamos estadísticas desde el CSV si no hay pkl.
+        Usa el snapshot binario precalculado si está al día; si no, el CSV.
         """
         logger.info("Cargando modelos y datos estadísticos...")
         try:
-            # Simulación de carga de modelos LSTM
-            # self.lstm_models = [load_model(f"lstm_model_{i}.keras") for i in range(1, 6)]
-            self.load_statistics()
-            self.is_loaded = True
-            logger.info("Sistema de predicción listo.")
+            # Ensemble LSTM exportado a .npz (inferencia NumPy) o placeholder simulado
+            self.scorer = load_scorer(MODEL_DIR)
+            self._swap(self.load_statistics())
         except Exception as e:
             logger.error(f"Error cargando modelos: {e}")
-            self.is_loaded = False
-
-    def load_statistics(self):
-        """Carga o calcula estadísticas básicas del CSV"""
-        if os.path.exists(CSV_FILE):
-            df = pd.read_csv(CSV_FILE)
-            # Calcular frecuencia simple como 'stat_score' base
-            numeros = []
-            for col in ['N1', 'N2', 'N3', 'N4', 'N5', 'N6']:
-                numeros.extend(pd.to_numeric(df[col], errors='coerce').dropna().tolist())
-            
-            freq_series = pd.Series(numeros).value_counts(normalize=True)
-            self.stats = freq_series.to_dict()
-        else:
+            self.is_loaded = self.snapshot is not None
+
+    def _swap(self, snapshot: EngineSnapshot):
+        """Publicación atómica en este proceso: un único cambio de referencia"""
+        self.snapshot = snapshot
+        # También al adjuntar un snapshot construido por otro worker o proceso
+        LOAD_STATISTICS_SECONDS.set(snapshot.build_seconds)
+        self.is_loaded = True
+        self.response_cache.clear()
+        logger.info(f"Sistema de predicción listo (snapshot {snapshot.version}).")
+
+    def publish(self, snapshot: EngineSnapshot):
+        """Publica un snapshot nuevo (p. ej. de un reentrenamiento) para todos los workers"""
+        SNAPSHOT_BUILD_SECONDS.observe(snapshot.build_seconds)
+        if self.shared is not None:
+            snapshot = self.shared.publish(snapshot)
+        self._swap(snapshot)
+
+    def load_statistics(self) -> EngineSnapshot:
+        """Construye o adjunta un snapshot sin tocar el publicado"""
+        source_hash = source_file_hash(CSV_FILE)
+        if self.shared is None:
+            return self._build_snapshot(source_hash)
+        # Un solo worker construye; el resto adjunta el mismo segmento compartido
+        return self.shared.attach_or_build(
+            lambda: self._build_snapshot(source_hash),
+            source_hash=source_hash, scorer=self.scorer.fingerprint
+        )
+
+    def _build_snapshot(self, source_hash: str) -> EngineSnapshot:
+        # Arranque rápido: mapear el snapshot binario si corresponde al CSV y al modelo
+        snapshot = load_snapshot(STAT_FILE, source_hash=source_hash, scorer=self.scorer.fingerprint)
+        if snapshot is not None:
+            return snapshot
+        if not os.path.exists(CSV_FILE):
             logger.warning("No se encontró archivo CSV para estadísticas.")
-            self.stats = {}
+        # Con el snapshot publicado solo se parsean los sorteos nuevos del CSV
+        snapshot = build_snapshot(CSV_FILE, previous=self.snapshot, scorer=self.scorer)
+        SNAPSHOT_BUILD_SECONDS.observe(snapshot.build_seconds)
+        return snapshot
 
-    def predict(self, top_n: int = 15, n_combinations: int = 10) -> PredictionResponse:
+    def _current(self) -> EngineSnapshot:
+        """Snapshot publicado (carga perezosa si aún no hay ninguno)"""
         if not self.is_loaded:
             self.load_models()
+        elif self.shared is not None:
+            # Otro worker pudo publicar un reentrenamiento
+            snapshot = self.shared.refresh()
+            if snapshot is not None:
+                self._swap(snapshot)
+        return self.snapshot
 
-        # Generar predicciones para todos los números (1-49)
-        all_preds = []
-        for num in range(1, 50):
-            # Obtener estadisticas reales
-            stat_score = self.stats.get(float(num), 0.0)
-            
-            # Simular LSTM score (0 a 1)
-            # TODO: Reemplazar con inferencia real de LSTM
-            lstm_score = random.random() * 0.5 
-            
-            # Weighted Fusion (60% LSTM + 40% Stat) según arquitectura
-            # Ajustamos escalas para que sean comparables
-            # Stat score suele ser bajo (ej 0.02), normalizamos un poco para el ejemplo
-            norm_stat = stat_score * 10  # Factor de escala arbitrario para demo
-            
-            final_score = (0.6 * lstm_score) + (0.4 * norm_stat)
-            
-            all_preds.append(NumberPrediction(
-                number=num,
-                score=round(final_score, 4),
-                lstm_score=round(lstm_score, 4),
-                stat_score=round(stat_score, 6)
-            ))
-        
-        # Ordenar por score descendente
-        all_preds.sort(key=lambda x: x.score, reverse=True)
-        top_numbers = all_preds[:top_n]
+    def predict(self, top_n: int = 15, n_combinations: int = 10,
+                window: Optional[int] = None, seed: Optional[int] = None,
+                strategy: str = DEFAULT_STRATEGY,
+                snapshot: Optional[EngineSnapshot] = None) -> PredictionResponse:
+        snapshot = snapshot or self._current()
+        top_idx, scores, stat_vector = self._rank(snapshot, top_n, window)
+        top_numbers = [
+            NumberPrediction(**row) for row in self._top_rows(snapshot, top_idx, scores, stat_vector)
+        ]
         
-        # Generar combinaciones basadas en los top numbers
-        # Estrategia simple: Sampling ponderado o aleatorio de los top N
-        combinations = []
-        top_nums_list = [p.number for p in top_numbers]
-        
-        if len(top_nums_list) >= 6:
-            for _ in range(n_combinations):
-                # Elegir 6 números al azar de los top_n
-                combo = sorted(random.sample(top_nums_list, min(6, len(top_nums_list))))
-                combinations.append(combo)
+        # Generar combinaciones basadas en los top numbers, sin combinaciones repetidas
+        # Generador propio por petición: con `seed` el resultado es reproducible
+        with ENGINE_STAGE_SECONDS.time(stage="sampling"):
+            combinations = strategy_combinations(
+                strategy, NUMBERS[top_idx], scores[top_idx], n_combinations,
+                rng=np.random.default_rng(seed)
+            ).tolist()
         
         return PredictionResponse(
             top_numbers=top_numbers,
             combinations=combinations,
+            metadata=self._metadata(snapshot, seed, strategy)
+        )
+
+    def predict_stream(self, top_n: int = 15, n_combinations: int = 10,
+                       window: Optional[int] = None, seed: Optional[int] = None,
+                       strategy: str = DEFAULT_STRATEGY) -> Iterator[bytes]:
+        """
+        Predicción en NDJSON: una primera línea con top_numbers y metadata y
+        después una línea por combinación, generadas y escritas por bloques.
+        """
+        snapshot = self._current()
+        top_idx, scores, stat_vector = self._rank(snapshot, top_n, window)
+        header = {
+            "top_numbers": self._top_rows(snapshot, top_idx, scores, stat_vector),
+            "metadata": self._metadata(snapshot, seed, strategy),
+        }
+        yield dumps(header) + b"\n"
+        for chunk in iter_strategy_combinations(
+            strategy, NUMBERS[top_idx], scores[top_idx], n_combinations,
+            rng=np.random.default_rng(seed), chunk_size=STREAM_CHUNK_SIZE
+        ):
+            # str() de una lista de enteros ya es JSON válido
+            yield ("\n".join(map(str, chunk.tolist())) + "\n").encode("utf-8")
+
+    def predict_batch(self, requests: List["UserPredictionRequest"]) -> bytes:
+        """
+        Varias predicciones contra el mismo snapshot, serializadas juntas.
+        El ranking se calcula una vez por (top_n, window) distinto y las
+        combinaciones muestreadas (weighted / random) salen de una sola pasada
+        vectorizada; con `seed` cada resultado coincide con el de /user/predict.
+        """
+        snapshot = self._current()
+        ranked = {}
+        for req in requests:
+            if (req.top_n, req.window) not in ranked:
+                ranked[req.top_n, req.window] = self._rank(snapshot, req.top_n, req.window)
+
+        picks = [ranked[req.top_n, req.window] for req in requests]
+        with ENGINE_STAGE_SECONDS.time(stage="sampling"):
+            sampled = [i for i, req in enumerate(requests) if req.strategy != "coverage"]
+            combinations = [None] * len(requests)
+            sets = sample_combination_sets(
+                [NUMBERS[picks[i][0]] for i in sampled],
+                [strategy_weights(requests[i].strategy, picks[i][1][picks[i][0]]) for i in sampled],
+                [requests[i].n_combinations for i in sampled],
+                [np.random.default_rng(requests[i].seed) for i in sampled],
+            )
+            for i, combos in zip(sampled, sets):
+                combinations[i] = combos
+            for i, req in enumerate(requests):
+                if combinations[i] is None:
+                    top_idx, scores, _ = picks[i]
+                    combinations[i] = strategy_combinations(
+                        req.strategy, NUMBERS[top_idx], scores[top_idx], req.n_combinations,
+                        rng=np.random.default_rng(req.seed)
+                    )
+        with ENGINE_STAGE_SECONDS.time(stage="serialization"):
+            return dumps([
+                {
+                    "top_numbers": self._top_rows(snapshot, top_idx, scores, stat_vector),
+                    "combinations": np.ascontiguousarray(combos),
+                    "metadata": self._metadata(snapshot, req.seed, req.strategy),
+                }
+                for req, (top_idx, scores, stat_vector), combos in zip(requests, picks, combinations)
+            ])
+
+    def _rank(self, snapshot: EngineSnapshot, top_n: int, window: Optional[int]):
+        """Índices top-N, scores fusionados y stat score usados en la predicción."""
+        if window is None:
+            # Scores ya fusionados y ordenados en el snapshot; top-N es un slice
+            stat_vector, scores = snapshot.stat_vector, snapshot.scores
+            with ENGINE_STAGE_SECONDS.time(stage="top_n"):
+                top_idx = snapshot.ranking[:max(0, min(top_n, len(NUMBERS)))]
+        else:
+            # Stat score de los últimos `window` sorteos: resta de sumas prefijas
+            with ENGINE_STAGE_SECONDS.time(stage="scoring"):
+                stat_vector = snapshot.statistics.frequency(last=window)
+                scores = np.round(fuse_scores(snapshot.lstm_vector, stat_vector, snapshot.weights), 4)
+            with ENGINE_STAGE_SECONDS.time(stage="top_n"):
+                top_idx = top_indices(scores, top_n)
+        return top_idx, scores, stat_vector
+
+    @staticmethod
+    def _top_rows(snapshot: EngineSnapshot, top_idx: np.ndarray, scores: np.ndarray,
+                  stat_vector: np.ndarray) -> List[Dict[str, Any]]:
+        return [
+            {"number": num, "score": score, "lstm_score": lstm, "stat_score": stat}
+            for num, score, lstm, stat in zip(
+                NUMBERS[top_idx].tolist(),
+                scores[top_idx].tolist(),
+                np.round(snapshot.lstm_vector[top_idx], 4).tolist(),
+                np.round(stat_vector[top_idx], 6).tolist(),
+            )
+        ]
+
+    @staticmethod
+    def _metadata(snapshot: EngineSnapshot, seed: Optional[int], strategy: str) -> Dict[str, Any]:
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "model_version": snapshot.version,
+            "total_candidates": len(NUMBERS),
+            "seed": seed,
+            "strategy": strategy
+        }
+
+    def predict_json(self, top_n: int = 15, n_combinations: int = 10,
+                     window: Optional[int] = None, seed: Optional[int] = None,
+                     strategy: str = DEFAULT_STRATEGY) -> bytes:
+        """
+        Predicción serializada, servida desde la caché LRU+TTL si es posible.
+        Sin `seed`, peticiones iguales comparten respuesta mientras dure el TTL.
+        """
+        snapshot = self._current()
+        key = (top_n, n_combinations, window, seed, strategy, snapshot.version)
+        body = self.response_cache.get(key)
+        if body is None:
+            if self.fast_json:
+                body = self.predict_fast(top_n, n_combinations, window, seed, strategy, snapshot=snapshot)
+            else:
+                response = self.predict(top_n, n_combinations, window, seed, strategy, snapshot=snapshot)
+                with ENGINE_STAGE_SECONDS.time(stage="serialization"):
+                    body = response.model_dump_json().encode("utf-8")
+            self.response_cache.put(key, body)
+        return body
+
+    def predict_fast(self, top_n: int = 15, n_combinations: int = 10,
+                     window: Optional[int] = None, seed: Optional[int] = None,
+                     strategy: str = DEFAULT_STRATEGY,
+                     snapshot: Optional[EngineSnapshot] = None) -> bytes:
+        """
+        Mismo JSON que `predict`, serializado desde los arrays del motor sin
+        construir ni validar modelos pydantic (los datos ya son del motor).
+        """
+        snapshot = snapshot or self._current()
+        top_idx, scores, stat_vector = self._rank(snapshot, top_n, window)
+        with ENGINE_STAGE_SECONDS.time(stage="sampling"):
+            combinations = strategy_combinations(
+                strategy, NUMBERS[top_idx], scores[top_idx], n_combinations,
+                rng=np.random.default_rng(seed)
+            )
+        with ENGINE_STAGE_SECONDS.time(stage="serialization"):
+            return dumps({
+                "top_numbers": self._top_rows(snapshot, top_idx, scores, stat_vector),
+                "combinations": np.ascontiguousarray(combinations),
+                "metadata": self._metadata(snapshot, seed, strategy),
+            })
+
+    def check_history(self, combinations: List[List[int]]) -> HistoryCheckResponse:
+        """Compara combinaciones contra todos los sorteos históricos"""
+        snapshot = self._current()
+
+        matches = snapshot.draws.check(combinations)
+        return HistoryCheckResponse(
+            results=[
+                CombinationMatches(combination=sorted(combo), matches=m)
+                for combo, m in zip(combinations, matches)
+            ],
             metadata={
                 "timestamp": datetime.now().isoformat(),
-                "model_version": "1.0.0",
-                "total_candidates": len(all_preds)
+                "model_version": snapshot.version,
+                "total_draws": len(snapshot.draws)
             }
         )
 
+    def draws(self, limit: int) -> List[Dict[str, Any]]:
+        """Sorteos más recientes primero"""
+        store = self._current().store
+        return store.records(store.latest(limit))
+
+    def recent_draws(self, days: int) -> List[Dict[str, Any]]:
+        """Sorteos de los últimos N días desde la fecha más reciente"""
+        store = self._current().store
+        return store.records(store.recent_days(days))
+
+    def draw_by_date(self, fecha: str) -> Optional[Dict[str, Any]]:
+        """Sorteo de una fecha concreta, o None si no hubo"""
+        date = parse_date(fecha)
+        if np.isnat(date):
+            raise ValueError("Formato de fecha inválido. Use YYYY-MM-DD")
+        store = self._current().store
+        pos = store.find(date)
+        return store.records(slice(pos, pos + 1))[0] if pos is not None else None
+
+    def statistics_summary(self) -> JSONPayload:
+        """Estadísticas generales del conjunto de datos (JSON ya serializado)"""
+        return self._current().aggregates.estadisticas
+
+    def number_frequency(self) -> JSONPayload:
+        """Frecuencia de aparición de cada número 1-49 (JSON ya serializado)"""
+        return self._current().aggregates.frecuencia
+
+    def window_frequency(self, last: Optional[int] = None, since: Optional[str] = None,
+                         until: Optional[str] = None) -> Dict[str, Any]:
+        """Frecuencia por número en una ventana de sorteos y/o fechas"""
+        statistics = self._current().statistics
+
+        bounds = [None if value is None else parse_date(value) for value in (since, until)]
+        if any(bound is not None and np.isnat(bound) for bound in bounds):
+            raise ValueError("Formato de fecha inválido. Use YYYY-MM-DD")
+        start, stop = statistics.window_bounds(last, *bounds)
+        counts = statistics.window_counts(start, stop)
+        dates = statistics.dates[start:stop]
+        return {
+            "total_sorteos": stop - start,
+            "fecha_inicio": str(dates[0]) if len(dates) else None,
+            "fecha_fin": str(dates[-1]) if len(dates) else None,
+            "frecuencia": {str(num): count for num, count in zip(NUMBERS.tolist(), counts.tolist())}
+        }
+
+    def recency(self) -> Dict[str, Any]:
+        """Frecuencia con decaimiento exponencial (Freq + Recency)"""
+        statistics = self._current().statistics
+        return {
+            "vida_media_sorteos": statistics.half_life,
+            "recencia": {
+                str(num): round(value, 6)
+                for num, value in zip(NUMBERS.tolist(), statistics.recency().tolist())
+            }
+        }
+
     def retrain(self):
         """Simula el reentrenamiento o recarga de datos"""
         logger.info("Iniciando proceso de reentrenamiento/recarga...")
         self.load_models()
-        return {"status": "success", "message": "Datos recargados y estadísticas actualizadas"}
+        return {
+            "status": "success",
+            "message": "Datos recargados y estadísticas actualizadas",
+            "version": self.snapshot.version if self.snapshot else None
+        }
 
 # Instancia global del motor
-engine = PredictionEngine()
+# Un directorio compartido por despliegue (CSV + modelos), no uno por máquina
+engine = PredictionEngine(shared_dir=default_shared_dir(CSV_FILE, MODEL_DIR), fast_json=FAST_JSON)
+SNAPSHOT_AGE_SECONDS.set_function(
+    lambda: (datetime.now() - engine.snapshot.created_at).total_seconds() if engine.snapshot else None
+)
+# Reentrenamientos en un proceso aparte; el resultado se publica en el motor.
+# Con memoria compartida, el registro de trabajos es común a todos los workers
+retrain_jobs = RetrainJobManager(
+    publish=engine.publish,
+    registry=SharedJobRegistry(engine.shared) if engine.shared is not None else None,
+)
 
 # --- FastAPI App ---
 
@@ -143,6 +459,7 @@ async def lifespan(app: FastAPI):
     engine.load_models()
     yield
     # Limpieza al apagar
+    retrain_jobs.shutdown()
 
 app = FastAPI(
     title="Lotería Primitiva Prediction API",
@@ -151,6 +468,41 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI: cuenta peticiones y mide su latencia hasta el último
+    byte (incluidas las respuestas en streaming), etiquetadas por la plantilla
+    de ruta para no disparar la cardinalidad.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            path = route.path if route is not None else "unmatched"
+            HTTP_LATENCY.observe(time.perf_counter() - start, method=scope["method"], route=path)
+            HTTP_REQUESTS.inc(method=scope["method"], route=path, status=str(status))
+
+
+app.add_middleware(MetricsMiddleware)
+
 # --- Endpoints ---
 
 @app.get("/", summary="Root", description="API information endpoint")
@@ -162,6 +514,11 @@ def root():
         "docs_url": "/docs"
     }
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Métricas del proceso en formato de texto de Prometheus"""
+    return Response(content=REGISTRY.render(), headers={"Content-Type": CONTENT_TYPE})
+
 @app.get("/health", summary="Health Check")
 def health_check():
     return {"status": "ok", "engine_loaded": engine.is_loaded}
@@ -169,33 +526,200 @@ def health_check():
 @app.get("/predict", response_model=PredictionResponse, summary="Predict Lottery")
 def predict_lottery(
     top_n: int = Query(15, title="Top N", description="Number of top predictions to return"),
-    n_combinations: int = Query(10, title="N Combinations", description="Number of lottery combinations to generate")
+    n_combinations: int = Query(10, le=MAX_COMBINATIONS, title="N Combinations",
+                                description="Number of lottery combinations to generate (more: /predict/stream)"),
+    window: Optional[int] = Query(None, ge=1, title="Window", description="Use only the last N draws for the statistical score"),
+    seed: Optional[int] = Query(None, ge=0, title="Seed", description="Seed for reproducible combinations"),
+    strategy: Strategy = Query(DEFAULT_STRATEGY, title="Strategy", description="weighted | random | coverage")
 ):
     """
     Get lottery number predictions.
     
     Parameters:
     - **top_n**: Number of top numbers to return.
-    - **n_combinations**: Number of combinations to generate from those numbers.
+    - **n_combinations**: Number of combinations to generate from those numbers
+      (at most 10000; use /predict/stream for larger sets).
+    - **window**: Optional number of most recent draws used for the statistical score.
+    - **seed**: Optional seed; identical seeded requests return identical results.
+    - **strategy**: `weighted` (by score), `random` (uniform over the top numbers) or
+      `coverage` (maximize the pairs and triples of top numbers covered by the set;
+      only the first 5000 combinations are built for coverage, the rest are weighted).
+    """
+    body = engine.predict_json(top_n=top_n, n_combinations=n_combinations, window=window,
+                               seed=seed, strategy=strategy)
+    return Response(content=body, media_type="application/json")
+
+@app.get(
+    "/predict/stream",
+    summary="Predict Lottery (stream)",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+def predict_lottery_stream(
+    top_n: int = Query(15, title="Top N", description="Number of top predictions to return"),
+    n_combinations: int = Query(10, ge=1, title="N Combinations", description="Number of lottery combinations to generate"),
+    window: Optional[int] = Query(None, ge=1, title="Window", description="Use only the last N draws for the statistical score"),
+    seed: Optional[int] = Query(None, ge=0, title="Seed", description="Seed for reproducible combinations"),
+    strategy: Strategy = Query(DEFAULT_STRATEGY, title="Strategy", description="weighted | random | coverage")
+):
+    """
+    Same as /predict, streamed as NDJSON.
+
+    The first line holds `top_numbers` and `metadata`; every following line is
+    one combination. Combinations are written as they are generated, so memory
+    use does not grow with **n_combinations**.
     """
-    return engine.predict(top_n=top_n, n_combinations=n_combinations)
+    return StreamingResponse(
+        engine.predict_stream(top_n=top_n, n_combinations=n_combinations, window=window,
+                              seed=seed, strategy=strategy),
+        media_type="application/x-ndjson"
+    )
 
 @app.post("/user/predict", response_model=PredictionResponse, summary="User Predict")
 def user_predict(request: UserPredictionRequest):
     """
     User-facing prediction endpoint.
     """
-    return engine.predict(top_n=request.top_n, n_combinations=request.n_combinations)
+    body = engine.predict_json(
+        top_n=request.top_n, n_combinations=request.n_combinations,
+        window=request.window, seed=request.seed, strategy=request.strategy
+    )
+    return Response(content=body, media_type="application/json")
+
+@app.post("/user/predict/batch", response_model=List[PredictionResponse], summary="User Predict Batch")
+def user_predict_batch(requests: List[UserPredictionRequest]):
+    """
+    Several user predictions in one call.
+
+    Takes a list of `/user/predict` bodies and returns the predictions in the
+    same order. Numbers are scored once per distinct `top_n`/`window` and all
+    combination sets are sampled together; seeded items return the same
+    result as `/user/predict`. At most 100000 combinations per batch.
+    """
+    if len(requests) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"Máximo {MAX_BATCH_SIZE} peticiones por lote")
+    if sum(max(req.n_combinations, 0) for req in requests) > MAX_BATCH_COMBINATIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Máximo {MAX_BATCH_COMBINATIONS} combinaciones por lote; usa /predict/stream"
+        )
+    return Response(content=engine.predict_batch(requests), media_type="application/json")
+
+@app.post("/history/check", response_model=HistoryCheckResponse, summary="Check History")
+def check_history(request: HistoryCheckRequest):
+    """
+    Check one or many combinations against every historical draw.
+    Returns, per combination, how many draws hit each prize category.
+    """
+    try:
+        return engine.check_history(request.combinations)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/sorteos", response_model=List[SorteoResponse], summary="Sorteos")
+def get_sorteos(
+    limit: int = Query(100, ge=1, le=1000, title="Limit", description="Maximum number of draws")
+):
+    """
+    Historical draws, most recent first.
+    """
+    return engine.draws(limit)
+
+@app.get("/sorteos/recientes", response_model=List[SorteoResponse], summary="Sorteos Recientes")
+def get_sorteos_recientes(
+    dias: int = Query(30, ge=1, le=365, title="Dias", description="Days back from the most recent draw")
+):
+    """
+    Draws from the last N days, counted from the most recent draw.
+    """
+    return engine.recent_draws(dias)
+
+@app.get("/sorteos/fecha/{fecha}", response_model=SorteoResponse, summary="Sorteo por Fecha")
+def get_sorteo_fecha(fecha: str):
+    """
+    Draw held on a specific date (YYYY-MM-DD).
+    """
+    try:
+        sorteo = engine.draw_by_date(fecha)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if sorteo is None:
+        raise HTTPException(status_code=404, detail=f"No hay sorteo en la fecha {fecha}")
+    return sorteo
+
+def payload_response(request: Request, payload: JSONPayload) -> Response:
+    """Sirve JSON ya serializado con ETag; 304 si el cliente ya lo tiene"""
+    headers = {"ETag": payload.etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match", "")
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if payload.etag in candidates or "*" in candidates:
+        return Response(status_code=304, headers=headers)
+    return Response(content=payload.body, media_type="application/json", headers=headers)
+
+@app.get("/estadisticas", summary="Estadisticas")
+def get_estadisticas(request: Request):
+    """
+    General statistics of the dataset.
+    Precomputed per data snapshot; supports conditional requests (ETag).
+    """
+    return payload_response(request, engine.statistics_summary())
+
+@app.get("/numeros/frecuencia", summary="Frecuencia Numeros")
+def get_frecuencia(request: Request):
+    """
+    Frequency of each number (1-49) over the whole history.
+    Precomputed per data snapshot; supports conditional requests (ETag).
+    """
+    return payload_response(request, engine.number_frequency())
+
+@app.get("/numeros/frecuencia/ventana", summary="Window Frequency")
+def window_frequency(
+    ultimos: Optional[int] = Query(None, ge=1, title="Últimos", description="Number of most recent draws"),
+    desde: Optional[str] = Query(None, title="Desde", description="Start date (YYYY-MM-DD)"),
+    hasta: Optional[str] = Query(None, title="Hasta", description="End date (YYYY-MM-DD), inclusive")
+):
+    """
+    Frequency of each number (1-49) inside a window of draws.
+    Windows are resolved with precomputed prefix sums, no data rescan.
+    """
+    try:
+        return engine.window_frequency(last=ultimos, since=desde, until=hasta)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/numeros/recencia", summary="Recency")
+def recency():
+    """
+    Exponentially decayed frequency of each number (1-49).
+    """
+    return engine.recency()
 
 @app.post("/admin/retrain", summary="Admin Retrain")
-def admin_retrain(background_tasks: BackgroundTasks):
+def admin_retrain():
     """
     Trigger data refresh / retraining.
-    Reloads statistical data and recomputes scores.
+    Runs in a separate process and returns a job id immediately; if a retrain
+    is already in progress, that job is returned instead of starting another.
+    The new snapshot is hot-swapped into the engine when the job completes.
+    """
+    job, created = retrain_jobs.submit(
+        build_engine_snapshot, CSV_FILE, MODEL_DIR, engine.snapshot, STAT_FILE
+    )
+    return {
+        "message": "Retraining started" if created else "Retraining already in progress",
+        "job_id": job["job_id"],
+        "status": job["status"]
+    }
+
+@app.get("/admin/retrain/{job_id}", summary="Admin Retrain Status")
+def admin_retrain_status(job_id: str):
+    """
+    Status of a retraining job (pending, running, completed, failed).
     """
-    # Ejecutar en background para no bloquear
-    background_tasks.add_task(engine.retrain)
-    return {"message": "Retraining started in background"}
+    job = retrain_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Trabajo {job_id} no encontrado")
+    return job
 
 if __name__ == "__main__":
     import uvicorn
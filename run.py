@@ -5,19 +5,23 @@ import argparse
 import sys
 from lotto_downloader import LottoDownloader
 from lotto_transformer import LottoTransformer
+from lotto_engine.persistence import export_snapshot
 
 def download_only():
     """Solo descarga"""
     downloader = LottoDownloader('config.ini')
     return downloader.download()
 
-def transform_only(input_file, output_file):
+def transform_only(input_file, output_file, incremental=False):
     """Solo transformación"""
     transformer = LottoTransformer()
-    transformer.transform(input_file, output_file)
+    if incremental:
+        transformer.transform_incremental(input_file, output_file)
+    else:
+        transformer.transform(input_file, output_file)
     return output_file
 
-def full_pipeline():
+def full_pipeline(incremental=False):
     """Pipeline completo"""
     # Descargar
     raw_file = download_only()
@@ -25,9 +29,13 @@ def full_pipeline():
     
     # Transformar
     clean_file = 'data/historico_clean.csv'
-    transform_only(raw_file, clean_file)
+    transform_only(raw_file, clean_file, incremental)
     print(f"✅ Transformación: {clean_file}")
     
+    # Snapshot binario para el arranque rápido de la API
+    snapshot = export_snapshot(clean_file)
+    print(f"✅ Snapshot: {snapshot.version}")
+    
     return clean_file
 
 def main():
@@ -36,6 +44,8 @@ def main():
                        help='Acción a ejecutar')
     parser.add_argument('-i', '--input', help='Archivo de entrada (para transform)')
     parser.add_argument('-o', '--output', help='Archivo de salida (para transform)')
+    parser.add_argument('--incremental', action='store_true',
+                       help='Transformar solo los sorteos nuevos respecto a la salida existente')
     
     args = parser.parse_args()
     
@@ -48,11 +58,11 @@ def main():
             if not args.input or not args.output:
                 print("Error: transform requiere -i y -o")
                 sys.exit(1)
-            result = transform_only(args.input, args.output)
+            result = transform_only(args.input, args.output, args.incremental)
             print(f"Transformación completada: {result}")
             
         elif args.action == 'full':
-            result = full_pipeline()
+            result = full_pipeline(args.incremental)
             print(f"Pipeline completo: {result}")
             
     except Exception as e:
@@ -27,10 +27,12 @@ setup(
     python_requires=">=3.7",
     install_requires=[
         "pandas>=1.3.0",
+        "numpy>=1.24",
     ],
     entry_points={
         "console_scripts": [
             "lotto-transform=lotto_transformer.cli:main",
+            "lotto-engine=lotto_engine.cli:main",
         ],
     },
 )
\ No newline at end of file